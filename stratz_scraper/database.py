@@ -1,43 +1,130 @@
 from __future__ import annotations
 
 from contextlib import contextmanager, nullcontext
+from itertools import islice
 from pathlib import Path
+import queue
+import random
 import sqlite3
 import threading
 import time
 
+from .heroes import HEROES
 from .locking import FileLock
 
 DB_PATH = Path("dota.db")
 LOCK_PATH = DB_PATH.with_suffix(".lock")
 INITIAL_PLAYER_ID = 293053907
+SCHEMA_VERSION = 2
+
+CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout = 20000",
+    "PRAGMA synchronous = NORMAL",
+    "PRAGMA temp_store = MEMORY",
+    "PRAGMA mmap_size = 268435456",
+    "PRAGMA cache_size = -65536",
+)
+
+CONNECTION_POOL_SIZE = 16
+CONNECTION_STATEMENT_CACHE_SIZE = 512
+RELEASE_ASSIGNMENTS_BATCH_SIZE = 5000
+EXECUTEMANY_CHUNK_SIZE = 5000
+RETRY_BACKOFF_MAX = 10.0
 
 _INDEXES_ENSURED = False
+_SCHEMA_READY = False
+_SCHEMA_LOCK = threading.Lock()
 _THREAD_LOCAL = threading.local()
+_CONNECTION_POOL: queue.LifoQueue[sqlite3.Connection] = queue.LifoQueue(
+    maxsize=CONNECTION_POOL_SIZE
+)
+
+_RELEASE_STALE_ASSIGNMENTS_SQL = """
+    UPDATE players
+    SET assigned_to=NULL,
+        assigned_at=NULL
+    WHERE steamAccountId IN (
+        SELECT steamAccountId
+        FROM players
+        WHERE assigned_to IS NOT NULL
+          AND (
+              assigned_at IS NULL
+              OR assigned_at <= datetime('now', ?)
+          )
+        LIMIT ?
+    )
+"""
 
 
 def ensure_schema_exists() -> None:
-    DB_PATH.parent.mkdir(parents=True, exist_ok=True)
-    if DB_PATH.exists():
-        ensure_indexes()
+    """Create or migrate the database once per process.
+
+    Later calls return before touching the filesystem, so opening a new
+    connection does not stat ``DB_PATH`` again. Threads racing the first
+    call wait on ``_SCHEMA_LOCK`` rather than polling the file lock.
+    """
+
+    global _SCHEMA_READY
+    if _SCHEMA_READY:
         return
-    with FileLock(LOCK_PATH):
-        if DB_PATH.exists():
-            ensure_indexes(lock_acquired=True)
+    with _SCHEMA_LOCK:
+        if _SCHEMA_READY:
             return
-        ensure_schema(lock_acquired=True)
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        if DB_PATH.exists():
+            ensure_indexes()
+        else:
+            with FileLock(LOCK_PATH):
+                if DB_PATH.exists():
+                    ensure_indexes(lock_acquired=True)
+                else:
+                    ensure_schema(lock_acquired=True)
+        _SCHEMA_READY = True
 
 
 def connect() -> sqlite3.Connection:
     ensure_schema_exists()
-    connection = sqlite3.connect(DB_PATH, timeout=20, isolation_level=None)
-    connection.execute("PRAGMA busy_timeout = 20000")
+    connection = sqlite3.connect(
+        DB_PATH,
+        timeout=20,
+        isolation_level=None,
+        check_same_thread=False,
+        cached_statements=CONNECTION_STATEMENT_CACHE_SIZE,
+    )
+    for pragma in CONNECTION_PRAGMAS:
+        connection.execute(pragma)
     connection.row_factory = sqlite3.Row
     return connection
 
 
+def _acquire_connection() -> sqlite3.Connection:
+    try:
+        return _CONNECTION_POOL.get_nowait()
+    except queue.Empty:
+        return connect()
+
+
+def _release_connection(conn: sqlite3.Connection) -> None:
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        _CONNECTION_POOL.put_nowait(conn)
+    except (sqlite3.Error, queue.Full):
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+
 @contextmanager
 def db_connection(write: bool = False) -> sqlite3.Connection:
+    """Yield a connection; writes reuse this thread's cached connection.
+
+    A nested ``db_connection(write=True)`` hands back the enclosing scope's
+    connection untouched, so only the outermost scope rolls back a
+    transaction left open.
+    """
+
     ensure_schema_exists()
     conn = None
     if write:
@@ -46,9 +133,18 @@ def db_connection(write: bool = False) -> sqlite3.Connection:
             cache = {}
             _THREAD_LOCAL.connections = cache
         conn = cache.get("write")
+        depth = getattr(_THREAD_LOCAL, "write_depth", 0)
+        if depth and conn is not None:
+            _THREAD_LOCAL.write_depth = depth + 1
+            try:
+                yield conn
+            finally:
+                _THREAD_LOCAL.write_depth = depth
+            return
         if conn is not None:
             try:
-                conn.execute("SELECT 1")
+                # Attribute access raises on a closed connection without running SQL.
+                conn.in_transaction
             except sqlite3.Error:
                 try:
                     conn.close()
@@ -57,24 +153,36 @@ def db_connection(write: bool = False) -> sqlite3.Connection:
                 conn = None
                 cache.pop("write", None)
         if conn is None:
-            conn = connect()
+            conn = _acquire_connection()
             cache["write"] = conn
+        _THREAD_LOCAL.write_depth = 1
     else:
-        conn = connect()
+        conn = _acquire_connection()
     try:
         yield conn
     finally:
         if conn is not None:
-            try:
-                if conn.in_transaction:  # type: ignore[attr-defined]
-                    conn.rollback()
-            except sqlite3.Error:
-                pass
-            if not write:
-                conn.close()
+            if write:
+                _THREAD_LOCAL.write_depth = 0
+                try:
+                    if conn.in_transaction:  # type: ignore[attr-defined]
+                        conn.rollback()
+                except sqlite3.Error:
+                    pass
+            else:
+                _release_connection(conn)
+
+
+def warmup_write_connection() -> None:
+    """Open this thread's cached write connection ahead of its first use."""
+
+    with db_connection(write=True):
+        pass
 
 
 def close_cached_connections() -> None:
+    """Hand this thread's cached connections back to the shared pool."""
+
     cache = getattr(_THREAD_LOCAL, "connections", None)
     if not cache:
         return
@@ -82,10 +190,7 @@ def close_cached_connections() -> None:
         conn = cache.pop(key, None)
         if conn is None:
             continue
-        try:
-            conn.close()
-        except sqlite3.Error:
-            pass
+        _release_connection(conn)
     _THREAD_LOCAL.connections = {}
 
 
@@ -119,6 +224,13 @@ def _sql_requires_lock(sql: str) -> bool:
     return True
 
 
+def _retry_delay(retry_interval: float, attempt: int) -> float:
+    """Exponential backoff with jitter so contending writers do not retry in step."""
+
+    backoff = min(RETRY_BACKOFF_MAX, retry_interval * 2 ** min(attempt, 16))
+    return backoff * random.uniform(0.5, 1.5)
+
+
 def retryable_execute(
     target: sqlite3.Connection | sqlite3.Cursor,
     sql: str,
@@ -131,51 +243,89 @@ def retryable_execute(
     #if should_lock:
     #    with FileLock(LOCK_PATH):
     #        return target.execute(sql, parameters)
+    attempt = 0
     while True:
         try:
             return target.execute(sql, parameters)
         except sqlite3.OperationalError as exc:
             message = str(exc).lower()
             if "locked" in message or "busy" in message:
-                time.sleep(retry_interval)
+                time.sleep(_retry_delay(retry_interval, attempt))
+                attempt += 1
                 continue
             raise
 
 
-def retryable_executemany(
-    target: sqlite3.Connection | sqlite3.Cursor,
-    sql: str,
-    seq_of_parameters,
-    *,
-    retry_interval: float = 0.5,
-):
-    if not isinstance(seq_of_parameters, (list, tuple)):
-        seq_of_parameters = list(seq_of_parameters)
-    connection = target if isinstance(target, sqlite3.Connection) else target.connection
+def _begin_immediate(connection: sqlite3.Connection, retry_interval: float) -> None:
+    attempt = 0
     while True:
         try:
             connection.execute("BEGIN IMMEDIATE")
-            break
+            return
         except sqlite3.OperationalError as exc:
             message = str(exc).lower()
             if "locked" in message or "busy" in message:
-                time.sleep(retry_interval)
+                time.sleep(_retry_delay(retry_interval, attempt))
+                attempt += 1
                 continue
             raise
 
+
+@contextmanager
+def write_transaction(
+    target: sqlite3.Connection | sqlite3.Cursor,
+    *,
+    retry_interval: float = 0.5,
+):
+    """Group the enclosed statements into a single ``BEGIN IMMEDIATE`` transaction."""
+
+    connection = target if isinstance(target, sqlite3.Connection) else target.connection
+    _begin_immediate(connection, retry_interval)
     try:
-        result = target.executemany(sql, seq_of_parameters)
-        connection.execute("COMMIT")
-        return result
-    except Exception:
+        yield connection
+    except BaseException:
         try:
             connection.execute("ROLLBACK")
         except sqlite3.OperationalError:
             pass
         raise
+    else:
+        connection.execute("COMMIT")
+
+
+def retryable_executemany(
+    target: sqlite3.Connection | sqlite3.Cursor,
+    sql: str,
+    seq_of_parameters,
+    *,
+    retry_interval: float = 0.5,
+    chunk_size: int = EXECUTEMANY_CHUNK_SIZE,
+):
+    """Run ``executemany`` in write transactions of at most ``chunk_size`` rows.
+
+    ``seq_of_parameters`` is consumed lazily, so only one chunk is held in
+    memory. Inside an open transaction everything joins the caller's
+    transaction instead. Returns ``None`` without opening a transaction when
+    there are no parameters.
+    """
+
+    connection = target if isinstance(target, sqlite3.Connection) else target.connection
+    if connection.in_transaction:
+        return target.executemany(sql, seq_of_parameters)
+    parameters = iter(seq_of_parameters)
+    chunk = list(islice(parameters, chunk_size))
+    if not chunk:
+        return None
+    while True:
+        with write_transaction(connection, retry_interval=retry_interval):
+            result = target.executemany(sql, chunk)
+        chunk = list(islice(parameters, chunk_size))
+        if not chunk:
+            return result
 
 
 def ensure_schema(*, lock_acquired: bool = False) -> None:
+    global _INDEXES_ENSURED
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
     lock_ctx = nullcontext() if lock_acquired else FileLock(LOCK_PATH)
     with lock_ctx:
@@ -184,10 +334,13 @@ def ensure_schema(*, lock_acquired: bool = False) -> None:
             conn.execute("PRAGMA journal_mode=WAL;")
             conn.executescript(
                 """
+                BEGIN IMMEDIATE;
+                PRAGMA user_version = 0;
                 DROP TABLE IF EXISTS hero_stats;
                 DROP TABLE IF EXISTS players;
                 DROP TABLE IF EXISTS meta;
                 DROP TABLE IF EXISTS best;
+                DROP TABLE IF EXISTS heroes;
 
                 CREATE TABLE players (
                     steamAccountId INTEGER PRIMARY KEY,
@@ -210,7 +363,6 @@ def ensure_schema(*, lock_acquired: bool = False) -> None:
 
                 CREATE TABLE best (
                     hero_id INTEGER PRIMARY KEY,
-                    hero_name TEXT,
                     player_id INTEGER,
                     matches INTEGER,
                     wins INTEGER
@@ -221,6 +373,11 @@ def ensure_schema(*, lock_acquired: bool = False) -> None:
                     value TEXT NOT NULL
                 );
 
+                CREATE TABLE heroes (
+                    hero_id INTEGER PRIMARY KEY,
+                    name TEXT NOT NULL
+                );
+
                 """
             )
             conn.execute(
@@ -230,164 +387,229 @@ def ensure_schema(*, lock_acquired: bool = False) -> None:
                 """,
                 (INITIAL_PLAYER_ID,),
             )
+            conn.execute("COMMIT")
+        _INDEXES_ENSURED = False
         ensure_indexes(lock_acquired=True)
 
 
+_SCHEMA_MIGRATION_SQL = """
+    UPDATE players SET seen_count=0 WHERE seen_count IS NULL;
+    CREATE TABLE IF NOT EXISTS heroes (
+        hero_id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS idx_players_hero_queue
+        ON players (
+            hero_done,
+            assigned_to,
+            COALESCE(depth, 0),
+            steamAccountId
+        );
+    CREATE INDEX IF NOT EXISTS idx_players_hero_assignment_cursor
+        ON players (
+            hero_done,
+            assigned_to,
+            steamAccountId
+        )
+        WHERE hero_done=0 AND assigned_to IS NULL;
+    CREATE INDEX IF NOT EXISTS idx_players_hero_queue_seen
+        ON players (
+            hero_done,
+            assigned_to,
+            seen_count DESC,
+            COALESCE(depth, 0),
+            steamAccountId
+        );
+    CREATE INDEX IF NOT EXISTS idx_players_hero_cursor
+        ON players (steamAccountId)
+        WHERE hero_done=0 AND assigned_to IS NULL;
+    CREATE INDEX IF NOT EXISTS idx_players_hero_pending
+        ON players (steamAccountId)
+        WHERE hero_done=0;
+    CREATE INDEX IF NOT EXISTS idx_players_hero_refresh
+        ON players (
+            hero_done,
+            assigned_to,
+            COALESCE(hero_refreshed_at, '1970-01-01'),
+            steamAccountId
+        );
+    DROP INDEX IF EXISTS idx_players_hero_refresh_seen;
+    CREATE INDEX idx_players_hero_refresh_seen
+        ON players (
+            hero_done,
+            assigned_to,
+            COALESCE(hero_refreshed_at, '1970-01-01'),
+            seen_count DESC,
+            steamAccountId
+        )
+        WHERE hero_done=1 AND assigned_to IS NULL;
+    DROP INDEX IF EXISTS idx_players_discover_queue;
+    DROP INDEX IF EXISTS idx_players_discover_queue_seen;
+    CREATE INDEX IF NOT EXISTS idx_players_discover_assignment
+        ON players (
+            hero_done,
+            discover_done,
+            (assigned_to IS NOT NULL),
+            seen_count DESC,
+            COALESCE(depth, 0),
+            steamAccountId
+        )
+        WHERE hero_done=1
+          AND discover_done=0
+          AND (assigned_to IS NULL OR assigned_to='discover');
+    DROP INDEX IF EXISTS idx_players_assignment_state;
+    CREATE INDEX IF NOT EXISTS idx_players_assignment_state
+        ON players (
+            assigned_to,
+            assigned_at
+        )
+        WHERE assigned_to IS NOT NULL;
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_meta_key
+        ON meta (key);
+    CREATE INDEX IF NOT EXISTS idx_hero_stats_leaderboard
+        ON hero_stats (
+            heroId,
+            matches DESC,
+            wins DESC,
+            steamAccountId
+        );
+    CREATE INDEX IF NOT EXISTS idx_best_matches
+        ON best (matches DESC);
+    CREATE INDEX IF NOT EXISTS idx_hero_stats_order
+        ON hero_stats (
+            matches DESC,
+            wins DESC,
+            steamAccountId ASC
+        );
+    CREATE TRIGGER IF NOT EXISTS trg_best_after_hero_stats_insert
+        AFTER INSERT ON hero_stats
+        WHEN NEW.matches > 0
+    BEGIN
+        INSERT INTO best (hero_id, player_id, matches, wins)
+        SELECT hero_id, NEW.steamAccountId, NEW.matches, NEW.wins
+        FROM heroes
+        WHERE hero_id = NEW.heroId
+        ON CONFLICT(hero_id) DO UPDATE SET
+            matches=excluded.matches,
+            wins=excluded.wins,
+            player_id=excluded.player_id
+        WHERE excluded.matches > best.matches;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_best_after_hero_stats_update
+        AFTER UPDATE OF matches, wins ON hero_stats
+        WHEN NEW.matches > OLD.matches
+    BEGIN
+        INSERT INTO best (hero_id, player_id, matches, wins)
+        SELECT hero_id, NEW.steamAccountId, NEW.matches, NEW.wins
+        FROM heroes
+        WHERE hero_id = NEW.heroId
+        ON CONFLICT(hero_id) DO UPDATE SET
+            matches=excluded.matches,
+            wins=excluded.wins,
+            player_id=excluded.player_id
+        WHERE excluded.matches > best.matches;
+    END;
+"""
+
+
+def _schema_is_current() -> bool:
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    try:
+        conn.execute("PRAGMA busy_timeout = 5000")
+        return conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    finally:
+        conn.close()
+
+
 def ensure_indexes(*, lock_acquired: bool = False) -> None:
+    """Bring an existing database up to ``SCHEMA_VERSION``.
+
+    The migrations are skipped when ``PRAGMA user_version`` already matches;
+    bump ``SCHEMA_VERSION`` whenever the DDL below or ``heroes.json`` changes.
+    """
+
     global _INDEXES_ENSURED
     if _INDEXES_ENSURED:
         return
     DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    if _schema_is_current():
+        _INDEXES_ENSURED = True
+        return
     lock_ctx = nullcontext() if lock_acquired else FileLock(LOCK_PATH)
     with lock_ctx:
         with sqlite3.connect(DB_PATH, timeout=30, isolation_level=None) as conn:
             conn.execute("PRAGMA busy_timeout = 5000")
-            try:
-                conn.execute(
-                    "ALTER TABLE players ADD COLUMN seen_count INTEGER NOT NULL DEFAULT 0"
+            if conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION:
+                _INDEXES_ENSURED = True
+                return
+            conn.execute("PRAGMA journal_mode=WAL;")
+            players_columns = {row[1] for row in conn.execute("PRAGMA table_info(players)")}
+            best_columns = {row[1] for row in conn.execute("PRAGMA table_info(best)")}
+            column_changes = []
+            if "seen_count" not in players_columns:
+                column_changes.append(
+                    "ALTER TABLE players ADD COLUMN seen_count INTEGER NOT NULL DEFAULT 0;"
                 )
-            except sqlite3.OperationalError as exc:
-                message = str(exc).lower()
-                if "duplicate column name" not in message:
-                    raise
-            conn.execute(
-                "UPDATE players SET seen_count=0 WHERE seen_count IS NULL"
-            )
+            if "hero_name" in best_columns:
+                column_changes.append("ALTER TABLE best DROP COLUMN hero_name;")
+            # The whole migration is one transaction: a single commit, and an
+            # interrupted run leaves the previous schema version intact.
             conn.executescript(
-                """
-                CREATE INDEX IF NOT EXISTS idx_players_hero_queue
-                    ON players (
-                        hero_done,
-                        assigned_to,
-                        COALESCE(depth, 0),
-                        steamAccountId
-                    );
-                CREATE INDEX IF NOT EXISTS idx_players_hero_assignment_cursor
-                    ON players (
-                        hero_done,
-                        assigned_to,
-                        steamAccountId
-                    )
-                    WHERE hero_done=0 AND assigned_to IS NULL;
-                CREATE INDEX IF NOT EXISTS idx_players_hero_queue_seen
-                    ON players (
-                        hero_done,
-                        assigned_to,
-                        seen_count DESC,
-                        COALESCE(depth, 0),
-                        steamAccountId
-                    );
-                CREATE INDEX IF NOT EXISTS idx_players_hero_cursor
-                    ON players (steamAccountId)
-                    WHERE hero_done=0 AND assigned_to IS NULL;
-                CREATE INDEX IF NOT EXISTS idx_players_hero_pending
-                    ON players (steamAccountId)
-                    WHERE hero_done=0;
-                CREATE INDEX IF NOT EXISTS idx_players_hero_refresh
-                    ON players (
-                        hero_done,
-                        assigned_to,
-                        COALESCE(hero_refreshed_at, '1970-01-01'),
-                        steamAccountId
-                    );
-                DROP INDEX IF EXISTS idx_players_hero_refresh_seen;
-                CREATE INDEX idx_players_hero_refresh_seen
-                    ON players (
-                        hero_done,
-                        assigned_to,
-                        COALESCE(hero_refreshed_at, '1970-01-01'),
-                        seen_count DESC,
-                        steamAccountId
-                    )
-                    WHERE hero_done=1 AND assigned_to IS NULL;
-                DROP INDEX IF EXISTS idx_players_discover_queue;
-                DROP INDEX IF EXISTS idx_players_discover_queue_seen;
-                CREATE INDEX IF NOT EXISTS idx_players_discover_assignment
-                    ON players (
-                        hero_done,
-                        discover_done,
-                        (assigned_to IS NOT NULL),
-                        seen_count DESC,
-                        COALESCE(depth, 0),
-                        steamAccountId
-                    )
-                    WHERE hero_done=1
-                      AND discover_done=0
-                      AND (assigned_to IS NULL OR assigned_to='discover');
-                DROP INDEX IF EXISTS idx_players_assignment_state;
-                CREATE INDEX IF NOT EXISTS idx_players_assignment_state
-                    ON players (
-                        assigned_to,
-                        assigned_at
-                    )
-                    WHERE assigned_to IS NOT NULL;
-                CREATE UNIQUE INDEX IF NOT EXISTS idx_meta_key
-                    ON meta (key);
-                CREATE INDEX IF NOT EXISTS idx_hero_stats_leaderboard
-                    ON hero_stats (
-                        heroId,
-                        matches DESC,
-                        wins DESC,
-                        steamAccountId
-                    );
-                CREATE INDEX IF NOT EXISTS idx_hero_stats_order
-                    ON hero_stats (
-                        matches DESC,
-                        wins DESC,
-                        steamAccountId ASC
-                    );
-                """
+                "BEGIN IMMEDIATE;\n" + "\n".join(column_changes) + _SCHEMA_MIGRATION_SQL
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO heroes (hero_id, name) VALUES (?, ?)",
+                HEROES.items(),
             )
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            conn.execute("COMMIT")
     _INDEXES_ENSURED = True
 
 
+def _release_stale_assignment_batches(conn: sqlite3.Connection, age_modifier: str) -> int:
+    released = 0
+    while True:
+        cursor = retryable_execute(
+            conn,
+            _RELEASE_STALE_ASSIGNMENTS_SQL,
+            (age_modifier, RELEASE_ASSIGNMENTS_BATCH_SIZE),
+        )
+        batch = cursor.rowcount if cursor.rowcount is not None else 0
+        released += max(batch, 0)
+        if batch < RELEASE_ASSIGNMENTS_BATCH_SIZE:
+            return released
+
+
 def release_incomplete_assignments(max_age_minutes: int = 10, existing: sqlite3.Connection | None = None) -> int:
+    """Clear assignments older than ``max_age_minutes``.
+
+    Rows are released in batches of ``RELEASE_ASSIGNMENTS_BATCH_SIZE`` so each
+    write transaction stays short even when many assignments went stale.
+    """
+
     age_modifier = f"-{int(max_age_minutes)} minutes"
     if existing is None:
         with db_connection(write=True) as conn:
-            cursor = retryable_execute(
-                conn,
-                """
-                UPDATE players
-                SET assigned_to=NULL,
-                    assigned_at=NULL
-                WHERE assigned_to IS NOT NULL
-                  AND (
-                      assigned_at IS NULL
-                      OR assigned_at <= datetime('now', ?)
-                  )
-                """,
-                (age_modifier,),
-            )
-            return cursor.rowcount if cursor.rowcount is not None else 0
-    cursor = retryable_execute(
-        existing,
-        """
-        UPDATE players
-        SET assigned_to=NULL,
-            assigned_at=NULL
-        WHERE assigned_to IS NOT NULL
-          AND (
-              assigned_at IS NULL
-              OR assigned_at <= datetime('now', ?)
-          )
-        """,
-        (age_modifier,),
-    )
-    return cursor.rowcount if cursor.rowcount is not None else 0
+            return _release_stale_assignment_batches(conn, age_modifier)
+    return _release_stale_assignment_batches(existing, age_modifier)
 
 
 __all__ = [
     "connect",
     "db_connection",
     "close_cached_connections",
+    "warmup_write_connection",
     "ensure_schema_exists",
     "ensure_schema",
     "ensure_indexes",
     "release_incomplete_assignments",
     "retryable_execute",
     "retryable_executemany",
+    "write_transaction",
     "DB_PATH",
     "LOCK_PATH",
     "INITIAL_PLAYER_ID",
+    "RELEASE_ASSIGNMENTS_BATCH_SIZE",
+    "EXECUTEMANY_CHUNK_SIZE",
+    "SCHEMA_VERSION",
 ]
@@ -7,10 +7,12 @@ from os import open as osopen
 from os import remove
 from os import write as oswrite
 from pathlib import Path
-from time import sleep, time
+from time import monotonic, sleep
 
 
 class FileLock:
+    __slots__ = ("path", "interval", "timeout", "_owned", "_pid_bytes")
+
     def __init__(self, path: Path | str, interval: float = 0.5, timeout: float | None = None) -> None:
         self.path = Path(path)
         self.interval = interval
@@ -19,7 +21,7 @@ class FileLock:
         self._pid_bytes = str(getpid()).encode("ascii")
 
     def __enter__(self) -> "FileLock":
-        start = time()
+        start = monotonic()
         while True:
             try:
                 fd = osopen(self.path.as_posix(), O_CREAT | O_EXCL | O_WRONLY)
@@ -30,7 +32,7 @@ class FileLock:
                 self._owned = True
                 return self
             except (FileExistsError, PermissionError) as exc:
-                if self.timeout is not None and time() - start >= self.timeout:
+                if self.timeout is not None and monotonic() - start >= self.timeout:
                     raise TimeoutError from exc
                 sleep(self.interval)
 
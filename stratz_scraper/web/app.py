@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import gzip
+import hashlib
 
 from flask import Flask, Response, abort, jsonify, render_template, request
 
@@ -13,17 +15,25 @@ from ..database import (
 )
 from .assignment import assign_next_task, ensure_assignment_cleanup_scheduler
 from .config import STATIC_DIR, TEMPLATE_DIR
+from .json_provider import OrjsonProvider
 from .leaderboard import (
-    fetch_best_payload,
+    fetch_best_json,
+    fetch_best_json_gzip,
     fetch_hero_leaderboard,
     fetch_overall_leaderboard,
 )
 from .progress import fetch_progress
-from .request_utils import is_local_request
+from .request_utils import is_local_request, read_json_body
 from .seed import seed_players
-from .submissions import submit_discover_submission, submit_hero_submission
+from .submissions import (
+    ensure_submission_writer,
+    submit_discover_submission,
+    submit_hero_submission,
+)
 from .tasks import reset_player_task
 
+INDEX_CACHE_CONTROL = "private, max-age=3600"
+
 __all__ = ["create_app"]
 
 
@@ -33,17 +43,41 @@ def create_app() -> Flask:
         static_folder=str(STATIC_DIR),
         template_folder=str(TEMPLATE_DIR),
     )
+    app.json = OrjsonProvider(app)
 
     release_incomplete_assignments()
     ensure_assignment_cleanup_scheduler()
+    ensure_submission_writer()
+
+    index_variants: dict[bool, tuple[bytes, bytes, str]] = {}
+
+    def _index_variant(show_seed: bool) -> tuple[bytes, bytes, str]:
+        variant = index_variants.get(show_seed)
+        if variant is None:
+            body = render_template("index.html", show_seed=show_seed).encode("utf-8")
+            variant = (body, gzip.compress(body, 9), hashlib.sha1(body).hexdigest())
+            if not app.jinja_env.auto_reload:
+                index_variants[show_seed] = variant
+        return variant
 
     @app.teardown_appcontext
     def _teardown_connections(exception: object | None) -> None:
         close_cached_connections()
 
     @app.get("/")
-    def index() -> str:
-        return render_template("index.html", show_seed=is_local_request())
+    def index() -> Response:
+        body, compressed, etag = _index_variant(is_local_request())
+        response = Response(mimetype="text/html")
+        if "gzip" in request.accept_encodings:
+            response.set_data(compressed)
+            response.headers["Content-Encoding"] = "gzip"
+            etag = f"{etag}-gzip"
+        else:
+            response.set_data(body)
+        response.set_etag(etag)
+        response.vary.add("Accept-Encoding")
+        response.headers["Cache-Control"] = INDEX_CACHE_CONTROL
+        return response.make_conditional(request)
 
     @app.post("/task")
     def task():
@@ -52,7 +86,7 @@ def create_app() -> Flask:
 
     @app.post("/task/reset")
     def reset_task():
-        data = request.get_json(force=True) or {}
+        data = read_json_body() or {}
         try:
             steam_account_id = int(data["steamAccountId"])
         except (KeyError, TypeError, ValueError):
@@ -67,7 +101,7 @@ def create_app() -> Flask:
 
     @app.post("/submit")
     def submit():
-        data = request.get_json(force=True)
+        data = read_json_body()
         task_type = data.get("type")
         request_new_task = data.get("task") is True
         if task_type == "fetch_hero_stats":
@@ -218,6 +252,13 @@ def create_app() -> Flask:
 
     @app.get("/best")
     def best():
-        return jsonify(fetch_best_payload())
+        response = Response(mimetype="application/json")
+        if "gzip" in request.accept_encodings:
+            response.set_data(fetch_best_json_gzip())
+            response.headers["Content-Encoding"] = "gzip"
+        else:
+            response.set_data(fetch_best_json())
+        response.vary.add("Accept-Encoding")
+        return response
 
     return app
@@ -2,10 +2,13 @@
 
 from __future__ import annotations
 
+import json
 import logging
 import threading
+from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
+from time import monotonic
 
 from ..database import (
     db_connection,
@@ -17,6 +20,9 @@ ASSIGNMENT_CLEANUP_KEY = "last_assignment_cleanup"
 HERO_ASSIGNMENT_CURSOR_KEY = "hero_assignment_cursor"
 ASSIGNMENT_CLEANUP_INTERVAL = timedelta(seconds=60)
 ASSIGNMENT_RETRY_INTERVAL = 0.05
+HERO_PREFETCH_BATCH_SIZE = 32
+HERO_PREFETCH_MAX_AGE = 60.0
+HERO_CURSOR_PERSIST_INTERVAL = 100
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,25 +34,143 @@ _checkpoint_executor = ThreadPoolExecutor(max_workers=1)
 _checkpoint_state_lock = threading.Lock()
 _checkpoint_pending = False
 
+_hero_prefetch: deque[tuple[int, float]] = deque()
+_hero_prefetch_lock = threading.Lock()
+
+_hero_cursor: int | None = None
+_hero_cursor_claims = 0
+_hero_cursor_generation = 0
+_hero_cursor_lock = threading.Lock()
+
+_SELECT_META_SQL = "SELECT value FROM meta WHERE key=?"
+
+_UPSERT_META_SQL = """
+    INSERT INTO meta (key, value)
+    VALUES (?, ?)
+    ON CONFLICT(key) DO UPDATE SET value=excluded.value
+"""
+
+_ASSIGN_DISCOVERY_SQL = """
+    WITH candidate AS (
+        SELECT steamAccountId, depth
+        FROM players
+        WHERE hero_done=1
+          AND discover_done=0
+          AND (assigned_to IS NULL OR assigned_to='discover')
+        ORDER BY (assigned_to IS NOT NULL),
+                 seen_count DESC,
+                 COALESCE(depth, 0) ASC,
+                 steamAccountId ASC
+        LIMIT 1
+    )
+    UPDATE players
+    SET assigned_to='discover',
+        assigned_at=CURRENT_TIMESTAMP
+    WHERE steamAccountId IN (SELECT steamAccountId FROM candidate)
+      AND (assigned_to IS NULL OR assigned_to='discover')
+    RETURNING steamAccountId, depth
+"""
+
+_RESTART_DISCOVERY_CYCLE_SQL = """
+    UPDATE players
+    SET discover_done=0,
+        seen_count=0,
+        depth=CASE WHEN depth=0 THEN 0 ELSE NULL END,
+        assigned_at=CASE WHEN assigned_to='discover' THEN NULL ELSE assigned_at END,
+        assigned_to=CASE WHEN assigned_to='discover' THEN NULL ELSE assigned_to END
+"""
+
+_SELECT_HERO_CANDIDATES_SQL = """
+    SELECT steamAccountId
+    FROM players
+    WHERE hero_done=0
+      AND assigned_to IS NULL
+      AND steamAccountId > ?
+    ORDER BY steamAccountId ASC
+    LIMIT ?
+"""
+
+_CLAIM_HERO_CANDIDATES_SQL = """
+    UPDATE players
+    SET assigned_to='hero',
+        assigned_at=CURRENT_TIMESTAMP
+    WHERE steamAccountId IN (SELECT value FROM json_each(?))
+      AND hero_done=0
+      AND assigned_to IS NULL
+"""
+
+_RELEASE_HERO_CLAIMS_SQL = """
+    UPDATE players
+    SET assigned_to=NULL,
+        assigned_at=NULL
+    WHERE steamAccountId IN (SELECT value FROM json_each(?))
+      AND hero_done=0
+      AND assigned_to='hero'
+"""
+
+_STAMP_HERO_ASSIGNMENT_SQL = """
+    UPDATE players
+    SET assigned_at=CURRENT_TIMESTAMP
+    WHERE steamAccountId=?
+      AND assigned_to='hero'
+"""
+
+_ASSIGN_HERO_REFRESH_SQL = """
+    WITH candidate AS (
+        SELECT steamAccountId
+        FROM players
+        WHERE hero_done=1
+          AND assigned_to IS NULL
+        ORDER BY COALESCE(hero_refreshed_at, '1970-01-01') ASC,
+                 seen_count DESC,
+                 steamAccountId ASC
+        LIMIT 1
+    )
+    UPDATE players
+    SET hero_done=0,
+        assigned_to='hero',
+        assigned_at=CURRENT_TIMESTAMP
+    WHERE steamAccountId IN (SELECT steamAccountId FROM candidate)
+      AND hero_done=1
+      AND assigned_to IS NULL
+    RETURNING steamAccountId
+"""
+
+_INCREMENT_ASSIGNMENT_COUNTER_SQL = """
+    INSERT INTO meta (key, value)
+    VALUES (?, '1')
+    ON CONFLICT(key) DO UPDATE SET value=CAST(value AS INTEGER) + 1
+    RETURNING CAST(value AS INTEGER) AS value
+"""
+
+_HERO_PENDING_SQL = "SELECT 1 FROM players WHERE hero_done=0 LIMIT 1"
+
 
 __all__ = [
     "ASSIGNMENT_CLEANUP_INTERVAL",
     "ASSIGNMENT_CLEANUP_KEY",
+    "HERO_CURSOR_PERSIST_INTERVAL",
+    "HERO_PREFETCH_BATCH_SIZE",
     "assign_next_task",
     "ensure_assignment_cleanup_scheduler",
     "maybe_run_assignment_cleanup",
+    "reset_hero_cursor",
 ]
 
 
 def _cleanup_worker(stop_event: threading.Event) -> None:
     interval_seconds = max(int(ASSIGNMENT_CLEANUP_INTERVAL.total_seconds()), 1)
     while not stop_event.is_set():
+        wait_seconds = interval_seconds
         try:
             with db_connection(write=True) as conn:
-                maybe_run_assignment_cleanup(conn)
+                if not maybe_run_assignment_cleanup(conn):
+                    # Another caller ran it recently; sleep until it is due again.
+                    remaining = _cleanup_due_in(conn.cursor(), datetime.now(timezone.utc))
+                    wait_seconds = min(max(remaining.total_seconds(), 1), interval_seconds)
         except Exception:  # pragma: no cover - best effort logging
             _LOGGER.exception("Assignment cleanup worker failed")
-        stop_event.wait(interval_seconds)
+        stop_event.wait(wait_seconds)
 
 
 def ensure_assignment_cleanup_scheduler() -> None:
@@ -92,32 +216,33 @@ def _schedule_checkpoint() -> None:
     _checkpoint_executor.submit(_run_wal_checkpoint)
 
 
+def _cleanup_due_in(cur, now: datetime) -> timedelta:
+    """Return how long until the next cleanup is due (non-positive when due)."""
+    last_cleanup_row = cur.execute(
+        _SELECT_META_SQL,
+        (ASSIGNMENT_CLEANUP_KEY,),
+    ).fetchone()
+    if not last_cleanup_row:
+        return timedelta(0)
+    try:
+        last_cleanup = datetime.fromisoformat(last_cleanup_row["value"])
+    except (TypeError, ValueError):
+        return timedelta(0)
+    if last_cleanup.tzinfo is None:
+        last_cleanup = last_cleanup.replace(tzinfo=timezone.utc)
+    return ASSIGNMENT_CLEANUP_INTERVAL - (now - last_cleanup)
+
+
 def maybe_run_assignment_cleanup(conn) -> bool:
     """Release stale assignments if the cleanup interval has elapsed."""
     cur = conn.cursor()
     now = datetime.now(timezone.utc)
-    last_cleanup_row = cur.execute(
-        "SELECT value FROM meta WHERE key=?",
-        (ASSIGNMENT_CLEANUP_KEY,),
-    ).fetchone()
-    if last_cleanup_row:
-        try:
-            last_cleanup = datetime.fromisoformat(last_cleanup_row["value"])
-        except (TypeError, ValueError):
-            pass
-        else:
-            if last_cleanup.tzinfo is None:
-                last_cleanup = last_cleanup.replace(tzinfo=timezone.utc)
-            if now - last_cleanup < ASSIGNMENT_CLEANUP_INTERVAL:
-                return False
+    if _cleanup_due_in(cur, now) > timedelta(0):
+        return False
     release_incomplete_assignments(existing=conn)
     retryable_execute(
         cur,
-        """
-        INSERT INTO meta (key, value)
-        VALUES (?, ?)
-        ON CONFLICT(key) DO UPDATE SET value=excluded.value
-        """,
+        _UPSERT_META_SQL,
         (ASSIGNMENT_CLEANUP_KEY, now.isoformat()),
         retry_interval=ASSIGNMENT_RETRY_INTERVAL,
     )
@@ -127,26 +252,7 @@ def maybe_run_assignment_cleanup(conn) -> bool:
 def _assign_discovery(cur) -> dict | None:
     assigned = retryable_execute(
         cur,
-        """
-        WITH candidate AS (
-            SELECT steamAccountId, depth
-            FROM players
-            WHERE hero_done=1
-              AND discover_done=0
-              AND (assigned_to IS NULL OR assigned_to='discover')
-            ORDER BY (assigned_to IS NOT NULL),
-                     seen_count DESC,
-                     COALESCE(depth, 0) ASC,
-                     steamAccountId ASC
-            LIMIT 1
-        )
-        UPDATE players
-        SET assigned_to='discover',
-            assigned_at=CURRENT_TIMESTAMP
-        WHERE steamAccountId IN (SELECT steamAccountId FROM candidate)
-          AND (assigned_to IS NULL OR assigned_to='discover')
-        RETURNING steamAccountId, depth
-        """,
+        _ASSIGN_DISCOVERY_SQL,
         retry_interval=ASSIGNMENT_RETRY_INTERVAL,
     ).fetchone()
     if not assigned:
@@ -162,79 +268,194 @@ def _assign_discovery(cur) -> dict | None:
 def _restart_discovery_cycle(cur) -> bool:
     retryable_execute(
         cur,
-        """
-        UPDATE players
-        SET discover_done=0,
-            seen_count=0,
-            depth=CASE WHEN depth=0 THEN 0 ELSE NULL END,
-            assigned_at=CASE WHEN assigned_to='discover' THEN NULL ELSE assigned_at END,
-            assigned_to=CASE WHEN assigned_to='discover' THEN NULL ELSE assigned_to END
-        """,
+        _RESTART_DISCOVERY_CYCLE_SQL,
         retry_interval=ASSIGNMENT_RETRY_INTERVAL,
     )
     return True
 
 
-def _assign_next_hero(cur) -> dict | None:
-    last_cursor_row = retryable_execute(
+def _pop_prefetched_hero(
+    taken: list[tuple[int, float]],
+) -> tuple[int | None, list[int]]:
+    """Pop the next fresh prefetched hero and any expired ones ahead of it.
+
+    Every popped entry is appended to ``taken`` so the caller can put it back
+    if its transaction rolls back. Returns the fresh id (or ``None``) and the
+    expired ids, which the caller must release in the database.
+    """
+
+    cutoff = monotonic() - HERO_PREFETCH_MAX_AGE
+    expired: list[int] = []
+    with _hero_prefetch_lock:
+        while _hero_prefetch:
+            entry = _hero_prefetch.popleft()
+            taken.append(entry)
+            steam_account_id, claimed_at = entry
+            if claimed_at >= cutoff:
+                return steam_account_id, expired
+            expired.append(steam_account_id)
+    return None, expired
+
+
+def _restore_prefetched_heroes(taken: list[tuple[int, float]]) -> None:
+    if not taken:
+        return
+    with _hero_prefetch_lock:
+        _hero_prefetch.extendleft(reversed(taken))
+
+
+def _store_prefetched_heroes(steam_account_ids: list[int]) -> None:
+    if not steam_account_ids:
+        return
+    claimed_at = monotonic()
+    with _hero_prefetch_lock:
+        _hero_prefetch.extend(
+            (steam_account_id, claimed_at) for steam_account_id in steam_account_ids
+        )
+
+
+def reset_hero_cursor() -> None:
+    """Make the next hero claim scan from the lowest account id again.
+
+    The reset is written through to ``meta`` so other processes and restarts
+    see it, and bumps a generation counter so an in-flight claim cannot
+    overwrite it with its end position.
+    """
+
+    global _hero_cursor, _hero_cursor_generation
+    with _hero_cursor_lock:
+        _hero_cursor = 0
+        _hero_cursor_generation += 1
+    with db_connection(write=True) as conn:
+        retryable_execute(
+            conn,
+            _UPSERT_META_SQL,
+            (HERO_ASSIGNMENT_CURSOR_KEY, "0"),
+            retry_interval=ASSIGNMENT_RETRY_INTERVAL,
+        )
+
+
+def _load_hero_cursor(cur) -> int:
+    row = retryable_execute(
         cur,
-        "SELECT value FROM meta WHERE key=?",
+        _SELECT_META_SQL,
         (HERO_ASSIGNMENT_CURSOR_KEY,),
         retry_interval=ASSIGNMENT_RETRY_INTERVAL,
     ).fetchone()
     try:
-        last_cursor = int(last_cursor_row["value"]) if last_cursor_row else 0
+        return int(row["value"]) if row else 0
     except (TypeError, ValueError):
-        last_cursor = 0
+        return 0
+
 
-    for offset in (last_cursor, 0):
-        assigned_row = retryable_execute(
+def _select_hero_candidates(cur, offset: int) -> list[int]:
+    rows = retryable_execute(
+        cur,
+        _SELECT_HERO_CANDIDATES_SQL,
+        (offset, HERO_PREFETCH_BATCH_SIZE),
+        retry_interval=ASSIGNMENT_RETRY_INTERVAL,
+    ).fetchall()
+    return [int(row["steamAccountId"]) for row in rows]
+
+
+def _claim_hero_batch(cur) -> list[int]:
+    """Claim the next run of pending hero accounts after the in-memory cursor.
+
+    Runs inside the caller's ``BEGIN IMMEDIATE`` transaction, so the candidate
+    SELECT and the claiming UPDATE cannot race other writers. The cursor is
+    written back to ``meta`` every ``HERO_CURSOR_PERSIST_INTERVAL`` claims.
+    """
+
+    global _hero_cursor, _hero_cursor_claims
+    with _hero_cursor_lock:
+        if _hero_cursor is None:
+            _hero_cursor = _load_hero_cursor(cur)
+        last_cursor = _hero_cursor
+        generation = _hero_cursor_generation
+
+    claimed = _select_hero_candidates(cur, last_cursor)
+    if not claimed and last_cursor > 0:
+        claimed = _select_hero_candidates(cur, 0)
+    next_cursor = claimed[-1] if claimed else 0
+    if claimed:
+        retryable_execute(
             cur,
-            """
-            WITH candidate AS (
-                SELECT steamAccountId
-                FROM players
-                WHERE hero_done=0
-                  AND assigned_to IS NULL
-                  AND steamAccountId > ?
-                ORDER BY steamAccountId ASC
-                LIMIT 1
-            )
-            UPDATE players
-            SET assigned_to='hero',
-                assigned_at=CURRENT_TIMESTAMP
-            WHERE steamAccountId IN (SELECT steamAccountId FROM candidate)
-              AND hero_done=0
-              AND assigned_to IS NULL
-            RETURNING steamAccountId
-            """,
-            (offset,),
+            _CLAIM_HERO_CANDIDATES_SQL,
+            (json.dumps(claimed),),
             retry_interval=ASSIGNMENT_RETRY_INTERVAL,
-        ).fetchone()
-        if assigned_row:
-            steam_account_id = int(assigned_row["steamAccountId"])
-            retryable_execute(
-                cur,
-                """
-                INSERT INTO meta (key, value)
-                VALUES (?, ?)
-                ON CONFLICT(key) DO UPDATE SET value=excluded.value
-                """,
-                (HERO_ASSIGNMENT_CURSOR_KEY, str(steam_account_id)),
-                retry_interval=ASSIGNMENT_RETRY_INTERVAL,
-            )
-            return {
-                "type": "fetch_hero_stats",
-                "steamAccountId": steam_account_id,
-            }
+        )
 
-    return None
+    with _hero_cursor_lock:
+        # A concurrent reset wins over the cursor we were about to advance.
+        if _hero_cursor_generation == generation:
+            _hero_cursor = next_cursor
+        _hero_cursor_claims += 1
+        persist_cursor = _hero_cursor_claims % HERO_CURSOR_PERSIST_INTERVAL == 0
+        cursor_value = _hero_cursor
+    if persist_cursor:
+        retryable_execute(
+            cur,
+            _UPSERT_META_SQL,
+            (HERO_ASSIGNMENT_CURSOR_KEY, str(cursor_value)),
+            retry_interval=ASSIGNMENT_RETRY_INTERVAL,
+        )
+    return claimed
+
+
+def _release_hero_claims(target, steam_account_ids: list[int]) -> None:
+    if not steam_account_ids:
+        return
+    retryable_execute(
+        target,
+        _RELEASE_HERO_CLAIMS_SQL,
+        (json.dumps(steam_account_ids),),
+        retry_interval=ASSIGNMENT_RETRY_INTERVAL,
+    )
+
+
+def _assign_next_hero(
+    cur,
+    spare_heroes: list[int],
+    taken_heroes: list[tuple[int, float]],
+) -> dict | None:
+    """Hand out a hero task, claiming a fresh batch when the prefetch runs dry.
+
+    Extra claimed accounts are appended to ``spare_heroes``; the caller stores
+    them for later requests once the claiming transaction has committed.
+    Prefetched entries consumed here are appended to ``taken_heroes`` so the
+    caller can restore them if the transaction rolls back. Expired spares are
+    released so they do not wait for the stale-assignment cleanup, and a
+    spare handed out is stamped with a fresh ``assigned_at`` so the worker
+    gets the full assignment window.
+    """
+
+    steam_account_id, expired = _pop_prefetched_hero(taken_heroes)
+    _release_hero_claims(cur, expired)
+    if steam_account_id is not None:
+        retryable_execute(
+            cur,
+            _STAMP_HERO_ASSIGNMENT_SQL,
+            (steam_account_id,),
+            retry_interval=ASSIGNMENT_RETRY_INTERVAL,
+        )
+    else:
+        claimed = _claim_hero_batch(cur)
+        if not claimed:
+            return None
+        steam_account_id = claimed[0]
+        spare_heroes.extend(claimed[1:])
+    return {
+        "type": "fetch_hero_stats",
+        "steamAccountId": steam_account_id,
+    }
 
 
 def assign_next_task(*, run_cleanup: bool = False) -> dict | None:
     """Select the next task to hand to a worker."""
     task_payload: dict | None = None
     should_checkpoint = False
+    spare_heroes: list[int] = []
+    taken_heroes: list[tuple[int, float]] = []
 
     with db_connection(write=True) as conn:
         if run_cleanup:
@@ -248,7 +469,7 @@ def assign_next_task(*, run_cleanup: bool = False) -> dict | None:
         cur = conn.cursor()
 
         counter_row = cur.execute(
-            "SELECT value FROM meta WHERE key=?",
+            _SELECT_META_SQL,
             ("task_assignment_counter",),
         ).fetchone()
         try:
@@ -278,26 +499,7 @@ def assign_next_task(*, run_cleanup: bool = False) -> dict | None:
                 if candidate_payload is None and refresh_due:
                     assigned_row = retryable_execute(
                         cur,
-                        """
-                        WITH candidate AS (
-                            SELECT steamAccountId
-                            FROM players
-                            WHERE hero_done=1
-                              AND assigned_to IS NULL
-                            ORDER BY COALESCE(hero_refreshed_at, '1970-01-01') ASC,
-                                     seen_count DESC,
-                                     steamAccountId ASC
-                            LIMIT 1
-                        )
-                        UPDATE players
-                        SET hero_done=0,
-                            assigned_to='hero',
-                            assigned_at=CURRENT_TIMESTAMP
-                        WHERE steamAccountId IN (SELECT steamAccountId FROM candidate)
-                          AND hero_done=1
-                          AND assigned_to IS NULL
-                        RETURNING steamAccountId
-                        """,
+                        _ASSIGN_HERO_REFRESH_SQL,
                         retry_interval=ASSIGNMENT_RETRY_INTERVAL,
                     ).fetchone()
                     if assigned_row:
@@ -307,12 +509,10 @@ def assign_next_task(*, run_cleanup: bool = False) -> dict | None:
                         }
 
                 if candidate_payload is None:
-                    candidate_payload = _assign_next_hero(cur)
+                    candidate_payload = _assign_next_hero(cur, spare_heroes, taken_heroes)
 
                 if candidate_payload is None:
-                    hero_pending = cur.execute(
-                        "SELECT 1 FROM players WHERE hero_done=0 LIMIT 1"
-                    ).fetchone()
+                    hero_pending = cur.execute(_HERO_PENDING_SQL).fetchone()
                     if not hero_pending and not discovery_due:
                         candidate_payload = _assign_discovery(cur)
 
@@ -329,9 +529,28 @@ def assign_next_task(*, run_cleanup: bool = False) -> dict | None:
                 loop_count = next_count
         except Exception:
             conn.rollback()
+            _restore_prefetched_heroes(taken_heroes)
             raise
-        else:
+        try:
             conn.commit()
+        except Exception:
+            if conn.in_transaction:
+                conn.rollback()
+                _restore_prefetched_heroes(taken_heroes)
+            else:
+                # SQLite ended the transaction despite the error, so whether
+                # the claims landed is unknown; release every hero this call
+                # touched instead of leaving them to the stale sweep.
+                unassigned = spare_heroes + [entry[0] for entry in taken_heroes]
+                if task_payload and task_payload["type"] == "fetch_hero_stats":
+                    unassigned.append(task_payload["steamAccountId"])
+                try:
+                    _release_hero_claims(conn, unassigned)
+                except Exception:  # pragma: no cover - best effort cleanup
+                    _LOGGER.exception("Failed to release hero claims")
+            raise
+
+    _store_prefetched_heroes(spare_heroes)
 
     if should_checkpoint:
         _schedule_checkpoint()
@@ -342,12 +561,7 @@ def assign_next_task(*, run_cleanup: bool = False) -> dict | None:
 def _increment_assignment_counter(cur) -> int:
     row = retryable_execute(
         cur,
-        """
-        INSERT INTO meta (key, value)
-        VALUES (?, '1')
-        ON CONFLICT(key) DO UPDATE SET value=CAST(value AS INTEGER) + 1
-        RETURNING CAST(value AS INTEGER) AS value
-        """,
+        _INCREMENT_ASSIGNMENT_COUNTER_SQL,
         ("task_assignment_counter",),
         retry_interval=ASSIGNMENT_RETRY_INTERVAL,
     ).fetchone()
@@ -0,0 +1,42 @@
+"""In-process caches for read-mostly endpoints."""
+
+from __future__ import annotations
+
+import threading
+from time import monotonic
+from typing import Callable, Generic, TypeVar
+
+T = TypeVar("T")
+
+__all__ = ["TimedCache"]
+
+
+class TimedCache(Generic[T]):
+    """Hold a single computed value for ``ttl`` seconds or until invalidated."""
+
+    __slots__ = ("ttl", "_lock", "_value", "_expires_at", "_generation")
+
+    def __init__(self, ttl: float) -> None:
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value: T | None = None
+        self._expires_at = 0.0
+        self._generation = 0
+
+    def get(self, loader: Callable[[], T]) -> T:
+        with self._lock:
+            if self._value is not None and monotonic() < self._expires_at:
+                return self._value
+            generation = self._generation
+        value = loader()
+        with self._lock:
+            if generation == self._generation:
+                self._value = value
+                self._expires_at = monotonic() + self.ttl
+        return value
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._value = None
+            self._expires_at = 0.0
+            self._generation += 1
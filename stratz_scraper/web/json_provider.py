@@ -0,0 +1,59 @@
+"""JSON provider that serializes API responses with ``orjson`` when available."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+__all__ = ["OrjsonProvider"]
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Drop-in replacement for Flask's provider backed by ``orjson``.
+
+    ``response()`` (and so ``jsonify``) encodes with ``orjson`` directly,
+    honouring ``compact`` via ``OPT_INDENT_2``. Direct ``dumps`` calls with
+    extra keyword arguments, and values ``orjson`` rejects (such as integers
+    wider than 64 bits), fall back to the standard library implementation.
+    """
+
+    def _orjson_dumps(self, obj: Any, option: int = 0) -> bytes | None:
+        option |= orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=self.default, option=option)
+        except TypeError:
+            return None
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        encoded = self._orjson_dumps(obj)
+        if encoded is None:
+            return super().dumps(obj)
+        return encoded.decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        option = 0
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            option = orjson.OPT_INDENT_2
+        encoded = self._orjson_dumps(obj, option)
+        if encoded is None:
+            return super().response(obj)
+        return self._app.response_class(encoded + b"\n", mimetype=self.mimetype)
@@ -2,12 +2,45 @@
 
 from __future__ import annotations
 
+import gzip
+import json
 from typing import Dict, List, Optional, Tuple
 
 from ..database import db_connection
 from ..heroes import HEROES, HERO_SLUGS, hero_slug
+from .cache import TimedCache
 
-__all__ = ["fetch_best_payload", "fetch_hero_leaderboard", "fetch_overall_leaderboard"]
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+BEST_CACHE_TTL = 60.0
+BEST_GZIP_LEVEL = 6
+
+_BEST_CACHE: TimedCache[tuple[bytes, bytes]] = TimedCache(BEST_CACHE_TTL)
+_JSON_ENCODER = json.JSONEncoder(separators=(",", ":"))
+
+_BEST_SQL = """
+    SELECT best.hero_id,
+           heroes.name AS hero_name,
+           best.player_id,
+           best.matches,
+           best.wins
+    FROM best
+    JOIN heroes USING (hero_id)
+    ORDER BY best.matches DESC
+"""
+
+__all__ = [
+    "BEST_CACHE_TTL",
+    "fetch_best_json",
+    "fetch_best_json_gzip",
+    "fetch_best_payload",
+    "fetch_hero_leaderboard",
+    "fetch_overall_leaderboard",
+    "invalidate_best_cache",
+]
 
 
 def fetch_hero_leaderboard(slug: str) -> Optional[Tuple[str, str, List[dict]]]:
@@ -17,7 +50,9 @@ def fetch_hero_leaderboard(slug: str) -> Optional[Tuple[str, str, List[dict]]]:
         return None
     hero_id, hero_name = hero_entry
     with db_connection() as conn:
-        rows = conn.execute(
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(
             """
             SELECT steamAccountId, matches, wins
             FROM hero_stats
@@ -29,18 +64,20 @@ def fetch_hero_leaderboard(slug: str) -> Optional[Tuple[str, str, List[dict]]]:
         ).fetchall()
     players = [
         {
-            "steamAccountId": row["steamAccountId"],
-            "matches": row["matches"],
-            "wins": row["wins"],
+            "steamAccountId": steam_account_id,
+            "matches": matches,
+            "wins": wins,
         }
-        for row in rows
+        for steam_account_id, matches, wins in rows
     ]
     return hero_name, normalized, players
 
 
 def fetch_overall_leaderboard() -> List[Dict[str, object]]:
     with db_connection() as conn:
-        rows = conn.execute(
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        rows = cursor.execute(
             """
             SELECT steamAccountId, matches, wins, heroId
             FROM hero_stats
@@ -49,15 +86,14 @@ def fetch_overall_leaderboard() -> List[Dict[str, object]]:
             """
         ).fetchall()
     players: List[Dict[str, object]] = []
-    for row in rows:
-        hero_id = row["heroId"]
+    for steam_account_id, matches, wins, hero_id in rows:
         hero_name = HEROES.get(hero_id)
         hero_slug_value = hero_slug(hero_name) if isinstance(hero_name, str) else None
         players.append(
             {
-                "steamAccountId": row["steamAccountId"],
-                "matches": row["matches"] or 0,
-                "wins": row["wins"] or 0,
+                "steamAccountId": steam_account_id,
+                "matches": matches or 0,
+                "wins": wins or 0,
                 "heroName": hero_name,
                 "heroSlug": hero_slug_value,
             }
@@ -65,13 +101,56 @@ def fetch_overall_leaderboard() -> List[Dict[str, object]]:
     return players
 
 
+def invalidate_best_cache() -> None:
+    _BEST_CACHE.invalidate()
+
+
+def fetch_best_json() -> bytes:
+    """Return the encoded ``/best`` payload, rebuilt only after invalidation."""
+
+    return _BEST_CACHE.get(_encode_best_variants)[0]
+
+
+def fetch_best_json_gzip() -> bytes:
+    """Return the gzip-compressed ``/best`` payload from the same cache entry."""
+
+    return _BEST_CACHE.get(_encode_best_variants)[1]
+
+
+def _best_row_payload(row: tuple) -> Dict:
+    hero_id, hero_name, player_id, matches, wins = row
+    return {
+        "hero_id": hero_id,
+        "hero_name": hero_name,
+        "player_id": player_id,
+        "matches": matches,
+        "wins": wins,
+        "hero_slug": hero_slug(hero_name) if isinstance(hero_name, str) else None,
+    }
+
+
+def _iter_best_rows(conn):
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor.execute(_BEST_SQL)
+
+
+def _encode_best_payload() -> bytes:
+    if orjson is not None:
+        return orjson.dumps(fetch_best_payload())
+    with db_connection() as conn:
+        encoded_rows = [
+            _JSON_ENCODER.encode(_best_row_payload(row))
+            for row in _iter_best_rows(conn)
+        ]
+    return f"[{','.join(encoded_rows)}]".encode("utf-8")
+
+
+def _encode_best_variants() -> tuple[bytes, bytes]:
+    body = _encode_best_payload()
+    return body, gzip.compress(body, BEST_GZIP_LEVEL)
+
+
 def fetch_best_payload() -> List[Dict]:
     with db_connection() as conn:
-        rows = conn.execute("SELECT * FROM best ORDER BY matches DESC").fetchall()
-    payload: List[Dict] = []
-    for row in rows:
-        row_dict = dict(row)
-        name = row_dict.get("hero_name")
-        row_dict["hero_slug"] = hero_slug(name) if isinstance(name, str) else None
-        payload.append(row_dict)
-    return payload
+        return [_best_row_payload(row) for row in _iter_best_rows(conn)]
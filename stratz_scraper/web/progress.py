@@ -3,11 +3,20 @@
 from __future__ import annotations
 
 from ..database import db_connection
+from .cache import TimedCache
 
-__all__ = ["fetch_progress"]
+PROGRESS_CACHE_TTL = 5.0
+
+_PROGRESS_CACHE: TimedCache[dict] = TimedCache(PROGRESS_CACHE_TTL)
+
+__all__ = ["PROGRESS_CACHE_TTL", "fetch_progress"]
 
 
 def fetch_progress() -> dict:
+    return _PROGRESS_CACHE.get(_load_progress)
+
+
+def _load_progress() -> dict:
     with db_connection() as conn:
         total = conn.execute("SELECT COUNT(*) AS c FROM players").fetchone()["c"]
         hero_done = (
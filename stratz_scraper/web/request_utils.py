@@ -2,9 +2,18 @@
 
 from __future__ import annotations
 
+import json
+from typing import Any
+
 from flask import Request, request
+from werkzeug.exceptions import BadRequest
+
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
 
-__all__ = ["is_local_request"]
+__all__ = ["is_local_request", "read_json_body"]
 
 
 def _is_loopback_address(address: str) -> bool:
@@ -29,3 +38,20 @@ def is_local_request(active_request: Request | None = None) -> bool:
 
     forwarded_for = (active_request.headers.get("X-Forwarded-For", "") if active_request else "").split(",")
     return any(_is_loopback_address(addr) for addr in forwarded_for)
+
+
+def read_json_body(active_request: Request | None = None) -> Any:
+    """Decode the request body as JSON regardless of its content type.
+
+    Uses ``orjson`` when it is installed and skips Flask's cached body and
+    ``get_json`` machinery, which only ever see a single read here.
+    """
+
+    active_request = active_request or request
+    body = active_request.get_data(cache=False)
+    try:
+        if orjson is not None:
+            return orjson.loads(body)
+        return json.loads(body)
+    except ValueError as exc:
+        raise BadRequest("Failed to decode JSON object") from exc
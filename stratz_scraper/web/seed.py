@@ -2,25 +2,31 @@
 
 from __future__ import annotations
 
-from ..database import db_connection, retryable_execute
+from ..database import db_connection, retryable_executemany
 
 __all__ = ["seed_players"]
 
 
 def seed_players(start: int, end: int) -> None:
+    """Insert every id in ``[start, end]`` as a fresh player.
+
+    ``retryable_executemany`` commits every ``EXECUTEMANY_CHUNK_SIZE`` rows,
+    so a failure partway leaves the earlier chunks seeded; rerunning the
+    same range is safe because existing players are ignored.
+    """
+
     with db_connection(write=True) as conn:
         cur = conn.cursor()
-        for pid in range(start, end + 1):
-            retryable_execute(
-                cur,
-                """
-                INSERT OR IGNORE INTO players (
-                    steamAccountId,
-                    depth,
-                    hero_done,
-                    discover_done
-                )
-                VALUES (?,?,0,0)
-                """,
-                (pid, 0),
+        retryable_executemany(
+            cur,
+            """
+            INSERT OR IGNORE INTO players (
+                steamAccountId,
+                depth,
+                hero_done,
+                discover_done
             )
+            VALUES (?,0,0,0)
+            """,
+            ((pid,) for pid in range(start, end + 1)),
+        )
@@ -8,6 +8,69 @@ const state = {
 const TOKEN_LOG_MAX_ENTRIES = 200;
 const DAY_IN_MS = 86_400_000;
 const NO_TASK_RETRY_DELAY_MS = 100;
+const LOG_FLUSH_INTERVAL_MS = 100;
+const DISPLAY_FLUSH_INTERVAL_MS = 100;
+const PERSIST_DEBOUNCE_MS = 500;
+const DISCOVERY_PAGE_WINDOW = 3;
+const STRATZ_RATE_LIMIT_PER_SECOND = 20;
+const STRATZ_RATE_LIMIT_BURST = 20;
+const BACKOFF_JITTER_RATIO = 0.2;
+const STRATZ_TRANSIENT_STATUSES = new Set([502, 503, 504]);
+const STRATZ_TRANSIENT_RETRIES = 2;
+const STRATZ_TRANSIENT_RETRY_BASE_MS = 500;
+const STRATZ_GRAPHQL_URL = "https://api.stratz.com/graphql";
+const TASK_URL = "/task";
+const TASK_RESET_URL = "/task/reset";
+const SUBMIT_URL = "/submit";
+const PROGRESS_URL = "/progress";
+const BEST_URL = "/best";
+const JSON_HEADERS = { "Content-Type": "application/json" };
+const TASK_REQUEST_BODY = JSON.stringify({ client: "browser" });
+
+// Queries are written readably but sent with whitespace collapsed to keep bodies small.
+function compactGraphQL(query) {
+  return query.replace(/\s+/g, " ").trim();
+}
+
+const HERO_PERFORMANCE_QUERY = compactGraphQL(`
+  query HeroPerf($id: Long!) {
+    player(steamAccountId: $id) {
+      heroesPerformance(request: { take: 999999, gameModeIds: [1, 22] }, take: 200) {
+        heroId
+        matchCount
+        winCount
+      }
+    }
+  }
+`);
+const playerMatchesQueries = new Map();
+
+// One request per discovery window: each page is an aliased matches field (m0, m1, ...).
+function getPlayerMatchesQuery(pageCount) {
+  let query = playerMatchesQueries.get(pageCount);
+  if (!query) {
+    const pageIndexes = Array.from({ length: pageCount }, (_, index) => index);
+    const skipVariables = pageIndexes.map((index) => `, $skip${index}: Int!`).join("");
+    const pageFields = pageIndexes
+      .map(
+        (index) => `
+      m${index}: matches(request: { take: $take, skip: $skip${index} }) {
+        players {
+          steamAccountId
+        }
+      }`,
+      )
+      .join("");
+    query = compactGraphQL(`
+  query PlayerMatches($steamAccountId: Long!, $take: Int!${skipVariables}) {
+    player(steamAccountId: $steamAccountId) {${pageFields}
+    }
+  }
+`);
+    playerMatchesQueries.set(pageCount, query);
+  }
+  return query;
+}
 
 const elements = {
   tokenList: document.getElementById("tokenList"),
@@ -46,10 +109,37 @@ function clearCookie(name) {
   document.cookie = `${name}=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/`;
 }
 
-function delay(ms) {
-  return new Promise((resolve) => setTimeout(resolve, ms));
+function waitForToken(token, ms) {
+  if (!(ms > 0) || token.stopRequested) {
+    return Promise.resolve();
+  }
+  return new Promise((resolve) => {
+    const finish = () => {
+      clearTimeout(timer);
+      if (token.wake === finish) {
+        token.wake = null;
+      }
+      resolve();
+    };
+    const timer = setTimeout(finish, ms);
+    token.wake = finish;
+  });
+}
+
+// Spread retries of tokens that failed together instead of waking them in lockstep.
+function jitterBackoff(ms) {
+  const factor = 1 - BACKOFF_JITTER_RATIO + Math.random() * 2 * BACKOFF_JITTER_RATIO;
+  return Math.min(Math.round(ms * factor), state.maxBackoff);
+}
+
+function wakeToken(token) {
+  if (typeof token?.wake === "function") {
+    token.wake();
+  }
 }
 
+const RETRY_AFTER_SECONDS_PATTERN = /^\d+$/;
+
 function parseRetryAfterHeader(value) {
   if (typeof value !== "string") {
     return null;
@@ -60,7 +150,12 @@ function parseRetryAfterHeader(value) {
     return null;
   }
 
-  const seconds = Number.parseFloat(trimmed);
+  if (RETRY_AFTER_SECONDS_PATTERN.test(trimmed)) {
+    return Number(trimmed) * 1000;
+  }
+
+  // Number() rejects trailing text, so dates such as "21 Oct 2015" fall through.
+  const seconds = Number(trimmed);
   if (Number.isFinite(seconds) && seconds >= 0) {
     return Math.ceil(seconds * 1000);
   }
@@ -158,17 +253,44 @@ function formatWinRate(wins, matches) {
   return `${rate.toFixed(1)}%`;
 }
 
+const pendingLogLines = new Map();
+const pendingTokenLogs = new Set();
+let logFlushTimer = null;
+
+function flushLogLines() {
+  logFlushTimer = null;
+  pendingLogLines.forEach(({ lines, maxLength, retainLength }, element) => {
+    let text = `${element.textContent}${lines.join("\n")}\n`;
+    if (text.length > maxLength) {
+      text = text.slice(-retainLength);
+    }
+    element.textContent = text;
+    element.scrollTop = element.scrollHeight;
+  });
+  pendingLogLines.clear();
+  pendingTokenLogs.forEach((token) => renderTokenLog(token));
+  pendingTokenLogs.clear();
+}
+
+function scheduleLogFlush() {
+  if (logFlushTimer === null) {
+    logFlushTimer = setTimeout(flushLogLines, LOG_FLUSH_INTERVAL_MS);
+  }
+}
+
 function appendLogLine(element, line, {
   maxLength = 50_000,
   retainLength = 40_000,
 } = {}) {
   if (!element) return;
 
-  element.textContent += `${line}\n`;
-  if (element.textContent.length > maxLength) {
-    element.textContent = element.textContent.slice(-retainLength);
+  let pending = pendingLogLines.get(element);
+  if (!pending) {
+    pending = { lines: [], maxLength, retainLength };
+    pendingLogLines.set(element, pending);
   }
-  element.scrollTop = element.scrollHeight;
+  pending.lines.push(line);
+  scheduleLogFlush();
 }
 
 function log(message) {
@@ -185,22 +307,23 @@ function formatDuration(ms) {
 }
 
 function getNowMs() {
-  return Date.now();
+  // Monotonic, so runtimes are unaffected by wall-clock adjustments.
+  return performance.now();
 }
 
-function getTokenRuntimeMs(token) {
+function getTokenRuntimeMs(token, now = getNowMs()) {
   if (!token) {
     return 0;
   }
   const total = Number.isFinite(token.totalRuntimeMs) ? token.totalRuntimeMs : 0;
   const active =
     token.running && typeof token.lastStartMs === "number"
-      ? Math.max(0, getNowMs() - token.lastStartMs)
+      ? Math.max(0, now - token.lastStartMs)
       : 0;
   return total + active;
 }
 
-function getTokenAverageTaskMs(token) {
+function getTokenAverageTaskMs(token, now = getNowMs()) {
   if (!token) {
     return NaN;
   }
@@ -208,7 +331,7 @@ function getTokenAverageTaskMs(token) {
   if (completed <= 0) {
     return NaN;
   }
-  const runtime = getTokenRuntimeMs(token);
+  const runtime = getTokenRuntimeMs(token, now);
   if (runtime <= 0) {
     return NaN;
   }
@@ -222,8 +345,8 @@ function formatAverageTaskTime(avgMs) {
   return formatDuration(Math.round(avgMs));
 }
 
-function getTokenTasksPerDay(token) {
-  const averageMs = getTokenAverageTaskMs(token);
+function getTokenTasksPerDay(token, now = getNowMs()) {
+  const averageMs = getTokenAverageTaskMs(token, now);
   if (!Number.isFinite(averageMs) || averageMs <= 0) {
     return NaN;
   }
@@ -292,13 +415,20 @@ function formatTokenSummaryMeta(token) {
   return parts.join(" • ");
 }
 
+function setText(element, text) {
+  const value = String(text);
+  if (element.textContent !== value) {
+    element.textContent = value;
+  }
+}
+
 function updateTokenSummary() {
   if (!elements.tokenSummary) {
     return;
   }
   const total = state.tokens.length;
   if (total === 0) {
-    elements.tokenSummary.textContent = "No tokens configured.";
+    setText(elements.tokenSummary, "No tokens configured.");
     return;
   }
 
@@ -319,7 +449,7 @@ function updateTokenSummary() {
   if (pieces.length === 1) {
     pieces.push("All idle");
   }
-  elements.tokenSummary.textContent = pieces.join(" · ");
+  setText(elements.tokenSummary, pieces.join(" · "));
 }
 
 function updateGlobalMetrics() {
@@ -331,13 +461,14 @@ function updateGlobalMetrics() {
   let totalTasks = 0;
   let totalTasksPerDay = 0;
   let hasTasksPerDay = false;
+  const now = getNowMs();
 
   state.tokens.forEach((token) => {
     const completed = Number.isFinite(token?.completedTasks) ? token.completedTasks : 0;
     if (!completed) {
       return;
     }
-    const runtime = getTokenRuntimeMs(token);
+    const runtime = getTokenRuntimeMs(token, now);
     if (runtime <= 0) {
       return;
     }
@@ -345,7 +476,7 @@ function updateGlobalMetrics() {
     totalRuntime += runtime;
     totalTasks += completed;
 
-    const tasksPerDay = getTokenTasksPerDay(token);
+    const tasksPerDay = getTokenTasksPerDay(token, now);
     if (Number.isFinite(tasksPerDay) && tasksPerDay > 0) {
       totalTasksPerDay += tasksPerDay;
       hasTasksPerDay = true;
@@ -356,42 +487,46 @@ function updateGlobalMetrics() {
   const expectedTasksPerDay = hasTasksPerDay ? totalTasksPerDay : NaN;
 
   if (elements.avgTaskTimeGlobal) {
-    elements.avgTaskTimeGlobal.textContent = formatAverageTaskTime(averageMs);
+    setText(elements.avgTaskTimeGlobal, formatAverageTaskTime(averageMs));
   }
 
   if (elements.tasksPerDayGlobal) {
-    elements.tasksPerDayGlobal.textContent = formatTasksPerDay(expectedTasksPerDay);
+    setText(elements.tasksPerDayGlobal, formatTasksPerDay(expectedTasksPerDay));
   }
 }
 
 function updateBackoffDisplay() {
-  const runningTokens = state.tokens.filter((token) => token.running);
-  if (!runningTokens.length) {
-    elements.backoffText.textContent = "—";
-    return;
+  let minBackoff = Infinity;
+  for (const token of state.tokens) {
+    if (token.running && token.backoff < minBackoff) {
+      minBackoff = token.backoff;
+    }
   }
-  const minBackoff = Math.min(...runningTokens.map((token) => token.backoff));
-  elements.backoffText.textContent = formatDuration(minBackoff);
+  setText(elements.backoffText, minBackoff === Infinity ? "—" : formatDuration(minBackoff));
 }
 
 function updateRequestsRemainingDisplay() {
   if (!elements.requestsRemaining) return;
-  const runningTokens = state.tokens.filter((token) => token.running);
-  if (!runningTokens.length) {
-    elements.requestsRemaining.textContent = "—";
-    return;
+  let running = 0;
+  let unlimited = false;
+  let total = 0;
+  for (const token of state.tokens) {
+    if (!token.running) {
+      continue;
+    }
+    running += 1;
+    if (token.requestsRemaining === null) {
+      unlimited = true;
+      break;
+    }
+    total += token.requestsRemaining ?? 0;
   }
 
-  if (runningTokens.some((token) => token.requestsRemaining === null)) {
-    elements.requestsRemaining.textContent = "∞";
+  if (!running) {
+    setText(elements.requestsRemaining, "—");
     return;
   }
-
-  const total = runningTokens.reduce(
-    (sum, token) => sum + (token.requestsRemaining ?? 0),
-    0,
-  );
-  elements.requestsRemaining.textContent = total;
+  setText(elements.requestsRemaining, unlimited ? "∞" : total);
 }
 
 function setAllTokensExpanded(expanded) {
@@ -432,20 +567,61 @@ function parseMaxRequests(value) {
   return Number.isFinite(max) && max > 0 ? max : null;
 }
 
-async function executeStratzQuery(query, variables, token) {
-  const activeToken = typeof token === "string" ? token.trim() : "";
-  if (!activeToken) {
-    throw new Error("Stratz token is not set");
+const stratzRateBuckets = new Map();
+
+function acquireStratzRequestSlot(activeToken) {
+  const now = performance.now();
+  let bucket = stratzRateBuckets.get(activeToken);
+  if (!bucket) {
+    bucket = { available: STRATZ_RATE_LIMIT_BURST, updatedAt: now };
+    stratzRateBuckets.set(activeToken, bucket);
   }
+  bucket.available = Math.min(
+    STRATZ_RATE_LIMIT_BURST,
+    bucket.available + ((now - bucket.updatedAt) * STRATZ_RATE_LIMIT_PER_SECOND) / 1000,
+  );
+  bucket.updatedAt = now;
+  // Reserve the slot before waiting so concurrent callers queue up behind it.
+  bucket.available -= 1;
+  if (bucket.available >= 0) {
+    return Promise.resolve();
+  }
+  const waitMs = (-bucket.available * 1000) / STRATZ_RATE_LIMIT_PER_SECOND;
+  return new Promise((resolve) => setTimeout(resolve, waitMs));
+}
 
-  const response = await fetch("https://api.stratz.com/graphql", {
-    method: "POST",
-    headers: {
+const stratzHeaders = new Map();
+
+function getStratzHeaders(activeToken) {
+  let headers = stratzHeaders.get(activeToken);
+  if (!headers) {
+    headers = {
       Authorization: `Bearer ${activeToken}`,
       "Content-Type": "application/json",
-    },
-    body: JSON.stringify({ query, variables }),
-  });
+    };
+    stratzHeaders.set(activeToken, headers);
+  }
+  return headers;
+}
+
+async function postStratzQuery(query, variables, activeToken) {
+  const body = JSON.stringify({ query, variables });
+  let response;
+  // Gateway errors are usually momentary; retry them briefly before failing the task.
+  for (let attempt = 0; ; attempt += 1) {
+    await acquireStratzRequestSlot(activeToken);
+    response = await fetch(STRATZ_GRAPHQL_URL, {
+      method: "POST",
+      headers: getStratzHeaders(activeToken),
+      body,
+    });
+    if (!STRATZ_TRANSIENT_STATUSES.has(response.status) || attempt >= STRATZ_TRANSIENT_RETRIES) {
+      break;
+    }
+    await new Promise((resolve) =>
+      setTimeout(resolve, jitterBackoff(STRATZ_TRANSIENT_RETRY_BASE_MS * 2 ** attempt)),
+    );
+  }
 
   if (!response.ok) {
     const error = new Error(`Stratz API returned ${response.status}`);
@@ -459,7 +635,16 @@ async function executeStratzQuery(query, variables, token) {
     throw error;
   }
 
-  const payload = await response.json();
+  return response.json();
+}
+
+async function executeStratzQuery(query, variables, token) {
+  const activeToken = typeof token === "string" ? token.trim() : "";
+  if (!activeToken) {
+    throw new Error("Stratz token is not set");
+  }
+
+  const payload = await postStratzQuery(query, variables, activeToken);
 
   if (payload && Array.isArray(payload.errors) && payload.errors.length > 0) {
     const message = payload.errors
@@ -471,27 +656,58 @@ async function executeStratzQuery(query, variables, token) {
   return payload;
 }
 
+const persistState = {
+  lastSerialized: undefined,
+  timer: null,
+  cookiesCleared: false,
+};
+
+function clearLegacyTokenCookies() {
+  if (persistState.cookiesCleared) {
+    return;
+  }
+  clearCookie("stratz_tokens");
+  clearCookie("stratz_token");
+  persistState.cookiesCleared = true;
+}
+
 function persistTokens() {
+  if (persistState.timer !== null) {
+    clearTimeout(persistState.timer);
+    persistState.timer = null;
+  }
+
   const payload = getPersistableTokens();
+  const serialized = payload.length ? JSON.stringify(payload) : null;
+  if (serialized === persistState.lastSerialized) {
+    return;
+  }
 
-  if (!payload.length) {
+  if (serialized === null) {
     try {
       localStorage.removeItem("stratz_tokens");
+      persistState.lastSerialized = serialized;
     } catch (error) {
       console.warn("Failed to remove saved tokens from localStorage", error);
     }
-    clearCookie("stratz_tokens");
-    clearCookie("stratz_token");
+    clearLegacyTokenCookies();
     return;
   }
 
   try {
-    localStorage.setItem("stratz_tokens", JSON.stringify(payload));
+    localStorage.setItem("stratz_tokens", serialized);
+    persistState.lastSerialized = serialized;
   } catch (error) {
     console.warn("Failed to persist tokens to localStorage", error);
   }
-  clearCookie("stratz_tokens");
-  clearCookie("stratz_token");
+  clearLegacyTokenCookies();
+}
+
+function schedulePersistTokens() {
+  if (persistState.timer !== null) {
+    clearTimeout(persistState.timer);
+  }
+  persistState.timer = setTimeout(persistTokens, PERSIST_DEBOUNCE_MS);
 }
 
 function getPersistableTokens() {
@@ -635,8 +851,23 @@ function handleImportFile(file) {
 }
 
 function getTokenLabel(token) {
-  const index = state.tokens.indexOf(token);
-  return index >= 0 ? index + 1 : token.id;
+  return Number.isFinite(token?.displayIndex) && token.displayIndex > 0
+    ? token.displayIndex
+    : token?.id;
+}
+
+function getTokenLogText(token) {
+  const entries = Array.isArray(token?.logEntries) ? token.logEntries : [];
+  return entries.slice(-TOKEN_LOG_MAX_ENTRIES).join("\n");
+}
+
+function renderTokenLog(token) {
+  const logView = token?.dom?.log;
+  if (!logView) {
+    return;
+  }
+  logView.textContent = getTokenLogText(token);
+  logView.scrollTop = logView.scrollHeight;
 }
 
 function logToken(token, message) {
@@ -652,15 +883,15 @@ function logToken(token, message) {
     token.logEntries = [];
   }
 
-  const entry = `[${timestamp}] ${message}`;
-  token.logEntries.push(entry);
-  if (token.logEntries.length > TOKEN_LOG_MAX_ENTRIES) {
-    token.logEntries.splice(0, token.logEntries.length - TOKEN_LOG_MAX_ENTRIES);
+  token.logEntries.push(`[${timestamp}] ${message}`);
+  if (token.logEntries.length >= TOKEN_LOG_MAX_ENTRIES * 2) {
+    token.logEntries = token.logEntries.slice(-TOKEN_LOG_MAX_ENTRIES);
   }
 
-  if (token.dom?.log) {
-    token.dom.log.textContent = token.logEntries.join("\n");
-    token.dom.log.scrollTop = token.dom.log.scrollHeight;
+  // Collapsed rows are re-rendered from logEntries when they are opened.
+  if (token.dom?.log && token.dom.row?.open) {
+    pendingTokenLogs.add(token);
+    scheduleLogFlush();
   }
 }
 
@@ -682,14 +913,16 @@ function updateTokenDisplay(token) {
     summaryMeta,
   } = token.dom;
 
-  tokenInput.value = token.value;
+  if (tokenInput.value !== token.value) {
+    tokenInput.value = token.value;
+  }
   tokenInput.disabled = token.running || token.stopRequested;
 
   maxInput.value = token.maxRequests;
   maxInput.disabled = token.running || token.stopRequested;
 
   if (summaryTitle) {
-    summaryTitle.textContent = formatTokenLabel(token);
+    setText(summaryTitle, formatTokenLabel(token));
   }
 
   const trimmed = token.value.trim();
@@ -703,37 +936,72 @@ function updateTokenDisplay(token) {
   } else if (token.stopRequested) {
     status = "Stopping…";
   }
-  statusValue.textContent = status;
+  setText(statusValue, status);
   if (summaryStatus) {
-    summaryStatus.textContent = status;
+    setText(summaryStatus, status);
   }
 
   const showBackoff = token.running || token.stopRequested;
-  backoffValue.textContent = showBackoff ? formatDuration(token.backoff) : "—";
+  setText(backoffValue, showBackoff ? formatDuration(token.backoff) : "—");
 
   if (token.requestsRemaining === null || token.requestsRemaining === undefined) {
-    requestsValue.textContent = "∞";
+    setText(requestsValue, "∞");
   } else {
-    requestsValue.textContent = token.requestsRemaining;
+    setText(requestsValue, token.requestsRemaining);
   }
   if (summaryMeta) {
-    summaryMeta.textContent = formatTokenSummaryMeta(token);
+    setText(summaryMeta, formatTokenSummaryMeta(token));
   }
 
-  const averageMs = getTokenAverageTaskMs(token);
+  const now = getNowMs();
+  const averageMs = getTokenAverageTaskMs(token, now);
   if (token.dom.avgTaskTimeValue) {
-    token.dom.avgTaskTimeValue.textContent = formatAverageTaskTime(averageMs);
+    setText(token.dom.avgTaskTimeValue, formatAverageTaskTime(averageMs));
   }
 
   if (token.dom.tasksPerDayValue) {
-    const tasksPerDay = getTokenTasksPerDay(token);
-    token.dom.tasksPerDayValue.textContent = formatTasksPerDay(tasksPerDay);
+    const tasksPerDay = getTokenTasksPerDay(token, now);
+    setText(token.dom.tasksPerDayValue, formatTasksPerDay(tasksPerDay));
   }
 
   row.classList.toggle("token-row-running", token.running && !token.stopRequested);
   row.classList.toggle("token-row-stopping", token.running && token.stopRequested);
 }
 
+const pendingTokenDisplays = new Set();
+let globalMetricsPending = false;
+let tokenDisplayTimer = null;
+
+function flushTokenDisplays() {
+  tokenDisplayTimer = null;
+  const tokens = Array.from(pendingTokenDisplays);
+  pendingTokenDisplays.clear();
+  tokens.forEach((token) => updateTokenDisplay(token));
+  if (globalMetricsPending) {
+    globalMetricsPending = false;
+    updateBackoffDisplay();
+    updateRequestsRemainingDisplay();
+    updateGlobalMetrics();
+  }
+}
+
+function scheduleDisplayFlush() {
+  if (tokenDisplayTimer === null) {
+    tokenDisplayTimer = setTimeout(flushTokenDisplays, DISPLAY_FLUSH_INTERVAL_MS);
+  }
+}
+
+function scheduleTokenDisplay(token) {
+  if (!token) return;
+  pendingTokenDisplays.add(token);
+  scheduleDisplayFlush();
+}
+
+function scheduleGlobalMetrics() {
+  globalMetricsPending = true;
+  scheduleDisplayFlush();
+}
+
 function updateRunningState() {
   state.running = state.tokens.some((token) => token.running);
   updateButtons();
@@ -777,6 +1045,7 @@ function requestStopForToken(token, { silent = false } = {}) {
     return;
   }
   token.stopRequested = true;
+  wakeToken(token);
   token.expanded = true;
   if (token.dom?.row) {
     token.dom.row.open = true;
@@ -807,6 +1076,7 @@ function addTokenRow(initial = {}, options = {}) {
     activeToken: null,
     stopRequested: false,
     dom: null,
+    wake: null,
     logEntries: [],
     totalRuntimeMs: 0,
     lastStartMs: null,
@@ -853,6 +1123,9 @@ function renderTokens() {
     row.open = Boolean(token.expanded);
     row.addEventListener("toggle", () => {
       token.expanded = row.open;
+      if (row.open) {
+        renderTokenLog(token);
+      }
       updateCollapseAllButton();
     });
 
@@ -898,7 +1171,7 @@ function renderTokens() {
     tokenInput.disabled = token.running || token.stopRequested;
     tokenInput.addEventListener("input", () => {
       token.value = tokenInput.value;
-      persistTokens();
+      schedulePersistTokens();
       updateButtons();
       updateTokenDisplay(token);
     });
@@ -916,7 +1189,7 @@ function renderTokens() {
         token.requestsRemaining = parseMaxRequests(maxInput.value);
         updateRequestsRemainingDisplay();
       }
-      persistTokens();
+      schedulePersistTokens();
       updateTokenDisplay(token);
     });
 
@@ -995,8 +1268,7 @@ function renderTokens() {
     const logView = document.createElement("pre");
     logView.className = "token-log";
     logView.setAttribute("aria-live", "polite");
-    const existingEntries = Array.isArray(token.logEntries) ? token.logEntries : [];
-    logView.textContent = existingEntries.join("\n");
+    logView.textContent = getTokenLogText(token);
     logView.scrollTop = logView.scrollHeight;
 
     logContainer.append(logLabel, logView);
@@ -1036,15 +1308,15 @@ function recordTaskCompletion(token) {
   }
   const completed = Number.isFinite(token.completedTasks) ? token.completedTasks : 0;
   token.completedTasks = completed + 1;
-  updateTokenDisplay(token);
-  updateGlobalMetrics();
+  scheduleTokenDisplay(token);
+  scheduleGlobalMetrics();
 }
 
 async function getTask() {
-  const response = await fetch("/task", {
+  const response = await fetch(TASK_URL, {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
-    body: JSON.stringify({ client: "browser" }),
+    headers: JSON_HEADERS,
+    body: TASK_REQUEST_BODY,
   });
   if (!response.ok) {
     throw new Error(`Task request failed with status ${response.status}`);
@@ -1055,9 +1327,9 @@ async function getTask() {
 
 async function resetTask(task) {
   if (!task) return;
-  const response = await fetch("/task/reset", {
+  const response = await fetch(TASK_RESET_URL, {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers: JSON_HEADERS,
     body: JSON.stringify({
       steamAccountId: task.steamAccountId,
       type: task.type,
@@ -1073,39 +1345,7 @@ async function fetchPlayerHeroes(playerId, token) {
     throw new Error('Stratz token is not set');
   }
 
-  const query = `
-    query HeroPerf($id: Long!) {
-      player(steamAccountId: $id) {
-        heroesPerformance(request: { take: 999999, gameModeIds: [1, 22] }, take: 200) {
-          heroId
-          matchCount
-          winCount
-        }
-      }
-    }
-  `;
-  const response = await fetch('https://api.stratz.com/graphql', {
-    method: 'POST',
-    headers: {
-      Authorization: `Bearer ${token}`,
-      'Content-Type': 'application/json',
-    },
-    body: JSON.stringify({ query, variables: { id: playerId } }),
-  });
-
-  if (!response.ok) {
-    const error = new Error(`Stratz API returned ${response.status}`);
-    if (response.status === 429) {
-      const retryAfterHeader = response.headers.get("retry-after");
-      const retryAfterMs = parseRetryAfterHeader(retryAfterHeader);
-      if (retryAfterMs !== null) {
-        error.retryAfterMs = retryAfterMs;
-      }
-    }
-    throw error;
-  }
-
-  const data = await response.json();
+  const data = await postStratzQuery(HERO_PERFORMANCE_QUERY, { id: playerId }, token);
   const heroes = data?.data?.player?.heroesPerformance;
   if (!Array.isArray(heroes)) {
     return [];
@@ -1123,58 +1363,58 @@ async function discoverMatches(playerId, token, { take = 100, skip = 0 } = {}) {
   const pageSize = Math.max(1, pageSizeCandidate);
   const startingSkip = Number.isFinite(skip) && skip > 0 ? Math.floor(skip) : 0;
 
-  const query = `
-    query PlayerMatches($steamAccountId: Long!, $take: Int!, $skip: Int!) {
-      player(steamAccountId: $steamAccountId) {
-        matches(request: { take: $take, skip: $skip }) {
-          id
-          players {
-            steamAccountId
-          }
-        }
-      }
-    }
-  `;
-
   const discovered = new Map();
-  let nextSkip = startingSkip;
-
-  while (true) {
-    const payload = await executeStratzQuery(
-      query,
-      { steamAccountId: playerId, take: pageSize, skip: nextSkip },
-      token,
-    );
-
-    const matches = payload?.data?.player?.matches;
-    if (!Array.isArray(matches) || matches.length === 0) {
-      break;
-    }
-
-    matches.forEach((match) => {
-      if (!Array.isArray(match?.players)) {
-        return;
+  const collectMatches = (matches) => {
+    for (const match of matches) {
+      const participants = match?.players;
+      if (!Array.isArray(participants)) {
+        continue;
       }
-      match.players.forEach((participant) => {
+      for (const participant of participants) {
         const rawId = participant?.steamAccountId;
         const id =
           typeof rawId === "number"
             ? rawId
             : typeof rawId === "string"
               ? Number.parseInt(rawId, 10)
-              : null;
+              : NaN;
         if (Number.isFinite(id) && id !== playerId) {
-          const previous = discovered.get(id) ?? 0;
-          discovered.set(id, previous + 1);
+          discovered.set(id, (discovered.get(id) ?? 0) + 1);
         }
-      });
-    });
-
-    if (matches.length < pageSize) {
-      break;
+      }
     }
+  };
+  const fetchPages = async (firstSkip, pageCount) => {
+    const variables = { steamAccountId: playerId, take: pageSize };
+    for (let index = 0; index < pageCount; index += 1) {
+      variables[`skip${index}`] = firstSkip + index * pageSize;
+    }
+    const payload = await executeStratzQuery(getPlayerMatchesQuery(pageCount), variables, token);
+    const player = payload?.data?.player;
+    return Array.from({ length: pageCount }, (_, index) => player?.[`m${index}`]);
+  };
 
-    nextSkip += matches.length;
+  // Most players fit in one page, so the first request asks for a single page;
+  // once a full page comes back, the following pages are fetched a window at a time.
+  let nextSkip = startingSkip;
+  let windowSize = 1;
+  let exhausted = false;
+
+  while (!exhausted) {
+    const pages = await fetchPages(nextSkip, windowSize);
+    for (const matches of pages) {
+      if (!Array.isArray(matches) || matches.length === 0) {
+        exhausted = true;
+        break;
+      }
+      collectMatches(matches);
+      if (matches.length < pageSize) {
+        exhausted = true;
+        break;
+      }
+      nextSkip += matches.length;
+    }
+    windowSize = DISCOVERY_PAGE_WINDOW;
   }
 
   return Array.from(discovered, ([steamAccountId, count]) => ({
@@ -1184,9 +1424,9 @@ async function discoverMatches(playerId, token, { take = 100, skip = 0 } = {}) {
 }
 
 async function submitHeroStats(playerId, heroes) {
-  const response = await fetch("/submit", {
+  const response = await fetch(SUBMIT_URL, {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers: JSON_HEADERS,
     body: JSON.stringify({
       type: "fetch_hero_stats",
       steamAccountId: playerId,
@@ -1211,9 +1451,9 @@ async function submitDiscovery(playerId, discovered, depth) {
   if (Number.isFinite(depth)) {
     payload.depth = depth;
   }
-  const response = await fetch("/submit", {
+  const response = await fetch(SUBMIT_URL, {
     method: "POST",
-    headers: { "Content-Type": "application/json" },
+    headers: JSON_HEADERS,
     body: JSON.stringify(payload),
   });
   if (!response.ok) {
@@ -1242,7 +1482,7 @@ function updateProgressDisplay(payload) {
 
 async function refreshProgress(options = {}) {
   const { force = false } = options;
-  const now = Date.now();
+  const now = getNowMs();
 
   if (!force) {
     if (progressState.inflight) {
@@ -1260,12 +1500,12 @@ async function refreshProgress(options = {}) {
   }
 
   const fetchPromise = (async () => {
-    const response = await fetch("/progress");
+    const response = await fetch(PROGRESS_URL);
     if (!response.ok) {
       throw new Error(`Progress failed with status ${response.status}`);
     }
     const payload = await response.json();
-    progressState.lastFetchTime = Date.now();
+    progressState.lastFetchTime = getNowMs();
     progressState.lastPayload = payload;
     updateProgressDisplay(payload);
     return payload;
@@ -1341,21 +1581,55 @@ function renderBestTable(rows) {
   elements.bestTable.innerHTML = `${header}${body}</tbody></table>`;
 }
 
-async function loadBest() {
+const bestState = {
+  inflight: null,
+  lastBody: null,
+  lastRows: [],
+};
+
+async function withButtonDisabled(button, action) {
+  if (button) {
+    button.disabled = true;
+  }
+  try {
+    return await action();
+  } finally {
+    if (button) {
+      button.disabled = false;
+    }
+  }
+}
+
+async function fetchBest() {
   setBestTableRefreshing(true);
   try {
-    const response = await fetch("/best");
+    const response = await fetch(BEST_URL);
     if (!response.ok) {
       throw new Error(`Best request failed with status ${response.status}`);
     }
-    const rows = await response.json();
+    const body = await response.text();
+    if (body === bestState.lastBody) {
+      return bestState.lastRows;
+    }
+    const rows = JSON.parse(body);
     renderBestTable(rows);
+    bestState.lastBody = body;
+    bestState.lastRows = rows;
     return rows;
   } finally {
     setBestTableRefreshing(false);
   }
 }
 
+function loadBest() {
+  if (!bestState.inflight) {
+    bestState.inflight = withButtonDisabled(elements.best, fetchBest).finally(() => {
+      bestState.inflight = null;
+    });
+  }
+  return bestState.inflight;
+}
+
 async function seedRange() {
   const start = parseInt(elements.seedStart.value, 10);
   const end = parseInt(elements.seedEnd.value, 10);
@@ -1401,9 +1675,9 @@ async function workLoopForToken(token) {
         const wait = 60_000;
         logToken(token, "No tasks available. Waiting 60 seconds before retrying.");
         token.backoff = wait;
-        updateBackoffDisplay();
-        updateTokenDisplay(token);
-        await delay(wait);
+        scheduleGlobalMetrics();
+        scheduleTokenDisplay(token);
+        await waitForToken(token, wait);
         if (token.stopRequested) {
           break;
         }
@@ -1415,24 +1689,18 @@ async function workLoopForToken(token) {
       }
       const taskId = task.steamAccountId;
       let nextTask = null;
+      // One log line per completed task; failures are logged with the task id below.
       if (task.type === "fetch_hero_stats") {
-        logToken(token, `Hero stats task for ${taskId}.`);
         const heroes = await fetchPlayerHeroes(taskId, token.activeToken);
-        logToken(token, `Fetched ${heroes.length} heroes for ${taskId}.`);
         nextTask = await submitHeroStats(taskId, heroes);
         logToken(token, `Submitted ${heroes.length} heroes for ${taskId}.`);
       } else if (task.type === "discover_matches") {
-        logToken(
-          token,
-          `Discovery task for ${taskId} (depth ${task.depth ?? 0}).`,
-        );
         const discovered = await discoverMatches(taskId, token.activeToken);
+        nextTask = await submitDiscovery(taskId, discovered, task.depth);
         logToken(
           token,
-          `Discovered ${discovered.length} accounts from ${taskId}.`,
+          `Submitted ${discovered.length} discovered accounts from ${taskId} (depth ${task.depth ?? 0}).`,
         );
-        nextTask = await submitDiscovery(taskId, discovered, task.depth);
-        logToken(token, `Submitted discovery results for ${taskId}.`);
       } else {
         logToken(
           token,
@@ -1448,8 +1716,8 @@ async function workLoopForToken(token) {
       recordTaskCompletion(token);
       if (token.requestsRemaining !== null) {
         token.requestsRemaining = Math.max(0, token.requestsRemaining - 1);
-        updateRequestsRemainingDisplay();
-        updateTokenDisplay(token);
+        scheduleGlobalMetrics();
+        scheduleTokenDisplay(token);
         if (token.requestsRemaining === 0) {
           if (nextTask) {
             try {
@@ -1469,10 +1737,10 @@ async function workLoopForToken(token) {
       }
       task = nextTask ?? null;
       token.backoff = 10000;
-      updateBackoffDisplay();
-      updateTokenDisplay(token);
+      scheduleGlobalMetrics();
+      scheduleTokenDisplay(token);
       if (!task) {
-        await delay(NO_TASK_RETRY_DELAY_MS);
+        await waitForToken(token, NO_TASK_RETRY_DELAY_MS);
       }
     } catch (error) {
       const message = error instanceof Error ? error.message : String(error);
@@ -1496,9 +1764,9 @@ async function workLoopForToken(token) {
       if (!hadTask) {
         const wait = 60_000;
         token.backoff = wait;
-        updateBackoffDisplay();
-        updateTokenDisplay(token);
-        await delay(wait);
+        scheduleGlobalMetrics();
+        scheduleTokenDisplay(token);
+        await waitForToken(token, wait);
       } else {
         const retryAfterMs = getRetryAfterMsFromError(error);
         let waitMs = token.backoff;
@@ -1508,18 +1776,18 @@ async function workLoopForToken(token) {
 
         waitMs = Math.max(0, waitMs);
         token.backoff = waitMs;
-        updateBackoffDisplay();
-        updateTokenDisplay(token);
+        scheduleGlobalMetrics();
+        scheduleTokenDisplay(token);
 
-        await delay(waitMs);
+        await waitForToken(token, retryAfterMs === null ? jitterBackoff(waitMs) : waitMs);
 
         if (retryAfterMs === null) {
           token.backoff = Math.min(
             Math.ceil(token.backoff * 1.2),
             state.maxBackoff,
           );
-          updateBackoffDisplay();
-          updateTokenDisplay(token);
+          scheduleGlobalMetrics();
+          scheduleTokenDisplay(token);
         }
       }
     }
@@ -1617,7 +1885,13 @@ function initialise() {
   updateGlobalMetrics();
   updateTokenSummary();
   refreshProgress().catch((error) => log(error.message));
-  loadBest().catch((error) => log(error.message));
+  // The leaderboard is below the fold; fetch and render it once the page is idle.
+  const loadInitialBest = () => loadBest().catch((error) => log(error.message));
+  if (typeof window.requestIdleCallback === "function") {
+    window.requestIdleCallback(loadInitialBest, { timeout: 2000 });
+  } else {
+    setTimeout(loadInitialBest, 0);
+  }
 }
 
 if (elements.addToken) {
@@ -1693,7 +1967,9 @@ elements.stop.addEventListener("click", () => {
 });
 
 elements.progress.addEventListener("click", () => {
-  refreshProgress({ force: true }).catch((error) => log(error.message));
+  withButtonDisabled(elements.progress, () => refreshProgress({ force: true })).catch(
+    (error) => log(error.message),
+  );
 });
 
 elements.best.addEventListener("click", () => {
@@ -1704,8 +1980,14 @@ elements.best.addEventListener("click", () => {
 
 if (elements.seedBtn) {
   elements.seedBtn.addEventListener("click", () => {
-    seedRange().catch((error) => log(error.message));
+    withButtonDisabled(elements.seedBtn, seedRange).catch((error) => log(error.message));
   });
 }
 
+window.addEventListener("pagehide", () => {
+  if (persistState.timer !== null) {
+    persistTokens();
+  }
+});
+
 initialise();
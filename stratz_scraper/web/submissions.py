@@ -2,16 +2,129 @@
 
 from __future__ import annotations
 
-from concurrent.futures import ThreadPoolExecutor
-from typing import Iterable, List
+import atexit
+import json
+import logging
+import queue
+import threading
+import traceback
+from typing import Callable, Iterable, List
 
-from ..database import db_connection, retryable_execute, retryable_executemany
-from ..heroes import HEROES
+from ..database import (
+    db_connection,
+    retryable_execute,
+    retryable_executemany,
+    warmup_write_connection,
+    write_transaction,
+)
+from .assignment import reset_hero_cursor
+from .leaderboard import invalidate_best_cache
 
-BACKGROUND_EXECUTOR = ThreadPoolExecutor(max_workers=4)
+try:  # pragma: no cover - optional dependency
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+SUBMISSION_BATCH_SIZE = 50
+SUBMISSION_SHUTDOWN_TIMEOUT = 10.0
+
+_LOGGER = logging.getLogger(__name__)
+
+_submission_queue: queue.SimpleQueue[tuple[str, tuple] | None] = queue.SimpleQueue()
+_writer_thread: threading.Thread | None = None
+_writer_lock = threading.Lock()
+
+
+def _accepts_int_sql(field: str) -> str:
+    """SQL predicate: ``{field}_type``/``{field}_value`` would pass ``int()``.
+
+    JSON numbers and booleans are accepted, as is text holding an optionally
+    signed run of digits; ``null``, objects, arrays and other text are not.
+    """
+
+    text = f"trim({field}_value, char(32, 9, 10, 13))"
+    return (
+        f"({field}_type IN ('integer', 'real', 'true', 'false')"
+        f" OR ({field}_type = 'text'"
+        f" AND ({text} GLOB '[0-9]*' OR {text} GLOB '[+-][0-9]*')"
+        f" AND substr({text}, 2) NOT GLOB '*[^0-9]*'))"
+    )
+
+
+# Hero submissions are bound as one JSON document shaped
+# ``[[steamAccountId, heroes], ...]`` and expanded by SQLite itself. Each
+# field is checked against what ``int()`` accepts before it is CAST; a
+# missing ``matches`` falls back to ``games`` and a missing ``wins`` to 0,
+# while an explicit ``null`` skips the entry.
+_HERO_STATS_UPSERT_SQL = f"""
+    INSERT INTO hero_stats (steamAccountId, heroId, matches, wins)
+    WITH fields AS (
+        SELECT submission.value ->> '$[0]' AS steamAccountId,
+               json_type(hero.value, '$.heroId') AS hero_type,
+               hero.value ->> '$.heroId' AS hero_value,
+               COALESCE(
+                   json_type(hero.value, '$.matches'),
+                   json_type(hero.value, '$.games')
+               ) AS matches_type,
+               CASE
+                   WHEN json_type(hero.value, '$.matches') IS NULL
+                   THEN hero.value ->> '$.games'
+                   ELSE hero.value ->> '$.matches'
+               END AS matches_value,
+               COALESCE(json_type(hero.value, '$.wins'), 'integer') AS wins_type,
+               COALESCE(hero.value ->> '$.wins', 0) AS wins_value
+        FROM json_each(?1) AS submission,
+             json_each(submission.value, '$[1]') AS hero
+        WHERE json_type(submission.value, '$[1]') = 'array'
+          AND hero.type = 'object'
+    ),
+    submitted AS (
+        SELECT CAST(steamAccountId AS INTEGER) AS steamAccountId,
+               CAST(hero_value AS INTEGER) AS heroId,
+               CAST(matches_value AS INTEGER) AS matches,
+               CAST(wins_value AS INTEGER) AS wins
+        FROM fields
+        WHERE {_accepts_int_sql("hero")}
+          AND {_accepts_int_sql("matches")}
+          AND {_accepts_int_sql("wins")}
+    )
+    SELECT steamAccountId, heroId, matches, wins
+    FROM submitted
+    WHERE heroId > 0
+    ON CONFLICT(steamAccountId, heroId) DO UPDATE SET
+        matches = CASE
+            WHEN excluded.matches > hero_stats.matches
+            THEN excluded.matches
+            ELSE hero_stats.matches
+        END,
+        wins = CASE
+            WHEN excluded.matches > hero_stats.matches
+            THEN excluded.wins
+            ELSE hero_stats.wins
+        END
+"""
+
+_DISCOVERED_PLAYERS_UPSERT_SQL = """
+    INSERT INTO players (
+        steamAccountId,
+        depth,
+        hero_done,
+        discover_done,
+        seen_count
+    )
+    VALUES (?,?,0,0,?)
+    ON CONFLICT(steamAccountId) DO UPDATE SET
+        depth=CASE
+            WHEN players.depth IS NULL THEN excluded.depth
+            WHEN excluded.depth < players.depth THEN excluded.depth
+            ELSE players.depth
+        END,
+        seen_count=players.seen_count + excluded.seen_count
+"""
 
 __all__ = [
-    "BACKGROUND_EXECUTOR",
+    "SUBMISSION_BATCH_SIZE",
+    "ensure_submission_writer",
     "process_discover_submission",
     "process_hero_submission",
     "submit_discover_submission",
@@ -36,8 +149,6 @@ def _unmark_hero_task(steam_account_id: int) -> None:
                 (steam_account_id,),
             )
     except Exception:
-        import traceback
-
         traceback.print_exc()
 
 
@@ -57,46 +168,17 @@ def _unmark_discover_task(steam_account_id: int) -> None:
                 (steam_account_id,),
             )
     except Exception:
-        import traceback
-
         traceback.print_exc()
 
 
-def _extract_hero_rows(
-    steam_account_id: int, heroes_payload: Iterable[dict] | None
-) -> tuple[
-    List[tuple[int, int, int, int]],
-    List[tuple[int, str, int, int, int]],
-]:
-    hero_stats_rows: List[tuple[int, int, int, int]] = []
-    best_rows: List[tuple[int, str, int, int, int]] = []
-    if heroes_payload is None:
-        return hero_stats_rows, best_rows
-    for hero in heroes_payload:
-        try:
-            hero_id = int(hero["heroId"])
-            matches_value = hero.get("matches", hero.get("games"))
-            if matches_value is None:
-                continue
-            matches = int(matches_value)
-            wins = int(hero.get("wins", 0))
-        except (KeyError, TypeError, ValueError):
-            continue
-        hero_stats_rows.append((steam_account_id, hero_id, matches, wins))
-        hero_name = HEROES.get(hero_id)
-        if hero_name:
-            best_rows.append((hero_id, hero_name, steam_account_id, matches, wins))
-    return hero_stats_rows, best_rows
-
-
 def _extract_discovered_counts(values: Iterable[object] | None) -> List[tuple[int, int]]:
-    aggregated: dict[int, int] = {}
-    order: List[int] = []
     if values is None:
         return []
+    # Dicts keep first-insertion order, which is the order ids were first seen.
+    aggregated: dict[int, int] = {}
+    aggregated_get = aggregated.get
     for value in values:
-        candidate_id = None
-        count_value: int | None = 1
+        count_raw = None
         if isinstance(value, dict):
             candidate_id = value.get("steamAccountId")
             if candidate_id is None:
@@ -104,34 +186,17 @@ def _extract_discovered_counts(values: Iterable[object] | None) -> List[tuple[in
             count_raw = value.get("count")
             if count_raw is None:
                 count_raw = value.get("seenCount")
-            if count_raw is not None:
-                try:
-                    count_value = int(count_raw)
-                except (TypeError, ValueError):
-                    count_value = 0
         else:
             candidate_id = value
         try:
             candidate_id = int(candidate_id)
+            count_value = 1 if count_raw is None else int(count_raw)
         except (TypeError, ValueError):
             continue
-        if candidate_id <= 0:
-            continue
-        if count_value is None:
-            count_value = 0
-        if not isinstance(count_value, int):
-            try:
-                count_value = int(count_value)
-            except (TypeError, ValueError):
-                count_value = 0
-        if count_value <= 0:
+        if candidate_id <= 0 or count_value <= 0:
             continue
-        if candidate_id not in aggregated:
-            aggregated[candidate_id] = count_value
-            order.append(candidate_id)
-        else:
-            aggregated[candidate_id] += count_value
-    return [(pid, aggregated[pid]) for pid in order]
+        aggregated[candidate_id] = aggregated_get(candidate_id, 0) + count_value
+    return list(aggregated.items())
 
 
 def _resolve_next_depth(
@@ -161,51 +226,68 @@ def _coerce_optional_int(value: object | None) -> int | None:
         return None
 
 
+def _discovered_child_rows(
+    steam_account_id: int,
+    discovered_payload: Iterable[object] | None,
+    provided_next_depth: int | None,
+    provided_depth: int | None,
+    assignment_depth: int | None,
+) -> List[tuple[int, int, int]]:
+    next_depth_value = _resolve_next_depth(
+        _coerce_optional_int(provided_next_depth),
+        _coerce_optional_int(provided_depth),
+        _coerce_optional_int(assignment_depth),
+    )
+    # _extract_discovered_counts already drops non-positive ids and counts.
+    return [
+        (new_id, next_depth_value, count)
+        for new_id, count in _extract_discovered_counts(discovered_payload)
+        if new_id != steam_account_id
+    ]
+
+
+def _write_hero_submissions(cur, submissions_json: str) -> bool:
+    """Upsert every hero row in ``submissions_json``.
+
+    The ``best`` table is kept in sync by triggers on ``hero_stats``; returns
+    ``True`` when those triggers changed it.
+    """
+
+    connection = cur.connection
+    changes_before = connection.total_changes
+    hero_cursor = retryable_execute(cur, _HERO_STATS_UPSERT_SQL, (submissions_json,))
+    # total_changes also counts rows written by triggers; rowcount does not.
+    trigger_changes = connection.total_changes - changes_before - max(
+        hero_cursor.rowcount, 0
+    )
+    return trigger_changes > 0
+
+
+def _encode_hero_submissions(submissions: list) -> str:
+    if orjson is not None:
+        try:
+            return orjson.dumps(submissions).decode("utf-8")
+        except TypeError:
+            # orjson rejects integers outside 64 bits; the stdlib does not.
+            pass
+    return json.dumps(submissions)
+
+
 def process_hero_submission(
     steam_account_id: int,
     heroes_payload: Iterable[dict] | None,
 ) -> None:
-    hero_stats_rows, best_rows = _extract_hero_rows(steam_account_id, heroes_payload)
+    if not heroes_payload:
+        return
     try:
+        submissions_json = _encode_hero_submissions([[steam_account_id, heroes_payload]])
         with db_connection(write=True) as conn:
             cur = conn.cursor()
-            if hero_stats_rows:
-                retryable_executemany(
-                    cur,
-                    """
-                    INSERT INTO hero_stats (steamAccountId, heroId, matches, wins)
-                    VALUES (?,?,?,?)
-                    ON CONFLICT(steamAccountId, heroId) DO UPDATE SET
-                        matches = CASE
-                            WHEN excluded.matches > hero_stats.matches
-                            THEN excluded.matches
-                            ELSE hero_stats.matches
-                        END,
-                        wins = CASE
-                            WHEN excluded.matches > hero_stats.matches
-                            THEN excluded.wins
-                            ELSE hero_stats.wins
-                        END
-                    """,
-                    hero_stats_rows,
-                )
-            if best_rows:
-                retryable_executemany(
-                    cur,
-                    """
-                    INSERT INTO best (hero_id, hero_name, player_id, matches, wins)
-                    VALUES (?,?,?,?,?)
-                    ON CONFLICT(hero_id) DO UPDATE SET
-                        matches=excluded.matches,
-                        wins=excluded.wins,
-                        player_id=excluded.player_id
-                    WHERE excluded.matches > best.matches
-                    """,
-                    best_rows,
-                )
+            with write_transaction(cur):
+                best_changed = _write_hero_submissions(cur, submissions_json)
+        if best_changed:
+            invalidate_best_cache()
     except Exception:
-        import traceback
-
         print(
             f"[submit-background] failed to process hero stats for {steam_account_id}",
             flush=True,
@@ -221,56 +303,21 @@ def process_discover_submission(
     provided_depth: int | None,
     assignment_depth: int | None,
 ) -> None:
-    parsed_next_depth = _coerce_optional_int(provided_next_depth)
-    parsed_depth = _coerce_optional_int(provided_depth)
-    parsed_assignment_depth = _coerce_optional_int(assignment_depth)
-    discovered_counts = _extract_discovered_counts(discovered_payload)
-    next_depth_value = _resolve_next_depth(
-        parsed_next_depth,
-        parsed_depth,
-        parsed_assignment_depth,
-    )
     try:
+        child_rows = _discovered_child_rows(
+            steam_account_id,
+            discovered_payload,
+            provided_next_depth,
+            provided_depth,
+            assignment_depth,
+        )
         with db_connection(write=True) as conn:
             cur = conn.cursor()
-            child_rows = [
-                (new_id, next_depth_value, max(count, 0))
-                for new_id, count in discovered_counts
-                if new_id != steam_account_id and count > 0
-            ]
             if child_rows:
-                retryable_executemany(
-                    cur,
-                    """
-                    INSERT INTO players (
-                        steamAccountId,
-                        depth,
-                        hero_done,
-                        discover_done,
-                        seen_count
-                    )
-                    VALUES (?,?,0,0,?)
-                    ON CONFLICT(steamAccountId) DO UPDATE SET
-                        depth=CASE
-                            WHEN players.depth IS NULL THEN excluded.depth
-                            WHEN excluded.depth < players.depth THEN excluded.depth
-                            ELSE players.depth
-                        END,
-                        seen_count=players.seen_count + excluded.seen_count
-                    """,
-                    child_rows,
-                )
-            retryable_execute(
-                cur,
-                """
-                UPDATE meta
-                SET value = '-1'
-                WHERE key = 'hero_assignment_cursor';
-                """
-            )
+                retryable_executemany(cur, _DISCOVERED_PLAYERS_UPSERT_SQL, child_rows)
+        if child_rows:
+            reset_hero_cursor()
     except Exception:
-        import traceback
-
         print(
             f"[submit-background] failed to process discovery for {steam_account_id}",
             flush=True,
@@ -279,15 +326,120 @@ def process_discover_submission(
         _unmark_discover_task(steam_account_id)
 
 
+_PROCESSORS: dict[str, Callable[..., None]] = {
+    "hero": process_hero_submission,
+    "discover": process_discover_submission,
+}
+
+
+def _process_submission_batch(batch: List[tuple[str, tuple]]) -> None:
+    """Write a batch of queued submissions in a single transaction.
+
+    If the combined write fails, each submission is replayed on its own so
+    that only the offending task is unmarked.
+    """
+
+    hero_submissions: List[list] = []
+    child_rows: List[tuple[int, int, int]] = []
+    best_changed = False
+    try:
+        for kind, args in batch:
+            if kind == "hero":
+                steam_account_id, heroes_payload = args
+                if heroes_payload:
+                    hero_submissions.append([steam_account_id, heroes_payload])
+            else:
+                child_rows.extend(_discovered_child_rows(*args))
+        with db_connection(write=True) as conn:
+            cur = conn.cursor()
+            with write_transaction(cur):
+                if hero_submissions:
+                    best_changed = _write_hero_submissions(
+                        cur, _encode_hero_submissions(hero_submissions)
+                    )
+                if child_rows:
+                    retryable_executemany(
+                        cur, _DISCOVERED_PLAYERS_UPSERT_SQL, child_rows
+                    )
+    except Exception:
+        print(
+            f"[submit-background] batch of {len(batch)} submissions failed; "
+            "retrying individually",
+            flush=True,
+        )
+        traceback.print_exc()
+        for kind, args in batch:
+            _PROCESSORS[kind](*args)
+        return
+    if best_changed:
+        invalidate_best_cache()
+    if child_rows:
+        reset_hero_cursor()
+
+
+def _submission_writer() -> None:
+    try:
+        warmup_write_connection()
+    except Exception:  # pragma: no cover - best effort logging
+        _LOGGER.exception("Submission writer could not open its connection")
+    while True:
+        item = _submission_queue.get()
+        stopping = item is None
+        batch = [] if stopping else [item]
+        while len(batch) < SUBMISSION_BATCH_SIZE:
+            try:
+                item = _submission_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                stopping = True
+                continue
+            batch.append(item)
+        if batch:
+            try:
+                _process_submission_batch(batch)
+            except Exception:  # pragma: no cover - best effort logging
+                _LOGGER.exception("Submission writer failed")
+        if stopping and _submission_queue.empty():
+            return
+
+
+def _stop_submission_writer() -> None:
+    thread = _writer_thread
+    if thread is None or not thread.is_alive():
+        return
+    _submission_queue.put(None)
+    thread.join(SUBMISSION_SHUTDOWN_TIMEOUT)
+
+
+def ensure_submission_writer() -> None:
+    """Start the single background thread that persists queued submissions."""
+
+    global _writer_thread
+    with _writer_lock:
+        if _writer_thread and _writer_thread.is_alive():
+            return
+        thread = threading.Thread(
+            target=_submission_writer,
+            name="submission-writer",
+            daemon=True,
+        )
+        thread.start()
+        if _writer_thread is None:
+            atexit.register(_stop_submission_writer)
+        _writer_thread = thread
+
+
+def _enqueue_submission(kind: str, args: tuple) -> None:
+    ensure_submission_writer()
+    _submission_queue.put((kind, args))
+
+
 def submit_hero_submission(
     steam_account_id: int,
     heroes_payload: Iterable[dict] | None,
 ) -> None:
-    BACKGROUND_EXECUTOR.submit(
-        process_hero_submission,
-        steam_account_id,
-        heroes_payload,
-    )
+    _enqueue_submission("hero", (steam_account_id, heroes_payload))
 
 
 def submit_discover_submission(
@@ -297,11 +449,13 @@ def submit_discover_submission(
     provided_depth: int | None,
     assignment_depth: int | None,
 ) -> None:
-    BACKGROUND_EXECUTOR.submit(
-        process_discover_submission,
-        steam_account_id,
-        discovered_payload,
-        provided_next_depth,
-        provided_depth,
-        assignment_depth,
+    _enqueue_submission(
+        "discover",
+        (
+            steam_account_id,
+            discovered_payload,
+            provided_next_depth,
+            provided_depth,
+            assignment_depth,
+        ),
     )
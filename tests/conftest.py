@@ -0,0 +1,24 @@
+import queue
+
+import pytest
+
+from stratz_scraper import database
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    """Point the database module at a fresh SQLite file for one test."""
+
+    path = tmp_path / "dota.db"
+    monkeypatch.setattr(database, "DB_PATH", path)
+    monkeypatch.setattr(database, "LOCK_PATH", path.with_suffix(".lock"))
+    monkeypatch.setattr(database, "_INDEXES_ENSURED", False, raising=False)
+    monkeypatch.setattr(database, "_SCHEMA_READY", False, raising=False)
+    database.close_cached_connections()
+    yield path
+    database.close_cached_connections()
+    while True:
+        try:
+            database._CONNECTION_POOL.get_nowait().close()
+        except queue.Empty:
+            break
@@ -0,0 +1,45 @@
+import json
+
+import pytest
+from flask import Flask, jsonify
+
+from stratz_scraper.web import json_provider
+from stratz_scraper.web.json_provider import OrjsonProvider
+
+orjson = pytest.importorskip("orjson")
+
+
+@pytest.fixture
+def app():
+    app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    return app
+
+
+def test_jsonify_encodes_with_orjson(app, monkeypatch):
+    calls = []
+    real_dumps = orjson.dumps
+
+    def spy(*args, **kwargs):
+        calls.append(args)
+        return real_dumps(*args, **kwargs)
+
+    monkeypatch.setattr(json_provider.orjson, "dumps", spy)
+    with app.app_context():
+        response = jsonify({"b": 1, "a": [1, 2]})
+    assert calls
+    assert response.get_data() == b'{"a":[1,2],"b":1}\n'
+
+
+def test_jsonify_indents_when_not_compact(app):
+    app.json.compact = False
+    with app.app_context():
+        response = jsonify({"a": 1})
+    assert response.get_data() == b'{\n  "a": 1\n}\n'
+
+
+def test_jsonify_falls_back_for_wide_integers(app):
+    value = 2**70
+    with app.app_context():
+        response = jsonify({"value": value})
+    assert json.loads(response.get_data()) == {"value": value}
@@ -0,0 +1,89 @@
+import sqlite3
+
+from stratz_scraper import database
+from stratz_scraper.heroes import HEROES
+
+
+def _create_v0_database(path):
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.executescript(
+        """
+        CREATE TABLE players (
+            steamAccountId INTEGER PRIMARY KEY,
+            depth INTEGER,
+            assigned_to TEXT,
+            assigned_at DATETIME,
+            hero_refreshed_at DATETIME,
+            hero_done INTEGER DEFAULT 0,
+            discover_done INTEGER DEFAULT 0
+        );
+        CREATE TABLE hero_stats (
+            steamAccountId INTEGER,
+            heroId INTEGER,
+            matches INTEGER,
+            wins INTEGER,
+            PRIMARY KEY (steamAccountId, heroId)
+        );
+        CREATE TABLE best (
+            hero_id INTEGER PRIMARY KEY,
+            hero_name TEXT,
+            player_id INTEGER,
+            matches INTEGER,
+            wins INTEGER
+        );
+        CREATE TABLE meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        INSERT INTO players (steamAccountId, depth) VALUES (1, 0);
+        INSERT INTO best VALUES (1, 'Anti-Mage', 1, 10, 5);
+        """
+    )
+    conn.close()
+
+
+def _columns(conn, table):
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def test_migrates_v0_database(db_path):
+    _create_v0_database(db_path)
+
+    database.ensure_indexes()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == database.SCHEMA_VERSION
+        assert "hero_name" not in _columns(conn, "best")
+        assert "seen_count" in _columns(conn, "players")
+        assert conn.execute("SELECT hero_id, player_id, matches, wins FROM best").fetchall() == [
+            (1, 1, 10, 5)
+        ]
+        assert dict(conn.execute("SELECT hero_id, name FROM heroes")) == HEROES
+        triggers = {
+            row[0]
+            for row in conn.execute("SELECT name FROM sqlite_master WHERE type='trigger'")
+        }
+        assert triggers == {
+            "trg_best_after_hero_stats_insert",
+            "trg_best_after_hero_stats_update",
+        }
+    finally:
+        conn.close()
+
+
+def test_best_triggers_track_top_player(db_path):
+    with database.db_connection(write=True) as conn:
+        conn.executemany(
+            "INSERT INTO hero_stats (steamAccountId, heroId, matches, wins) VALUES (?,?,?,?)",
+            [(1, 1, 10, 5), (2, 1, 5, 1), (3, 2, 0, 0), (4, 9999, 50, 10)],
+        )
+        best = conn.execute("SELECT hero_id, player_id, matches, wins FROM best").fetchall()
+        assert [tuple(row) for row in best] == [(1, 1, 10, 5)]
+
+        conn.execute("UPDATE hero_stats SET matches=20, wins=9 WHERE steamAccountId=2")
+        conn.execute("UPDATE hero_stats SET matches=3, wins=1 WHERE steamAccountId=3")
+        best = conn.execute(
+            "SELECT hero_id, player_id, matches, wins FROM best ORDER BY hero_id"
+        ).fetchall()
+        assert [tuple(row) for row in best] == [(1, 2, 20, 9), (2, 3, 3, 1)]
@@ -0,0 +1,112 @@
+import pytest
+
+from stratz_scraper.database import db_connection
+from stratz_scraper.web import submissions
+
+
+@pytest.fixture
+def invalidations(db_path, monkeypatch):
+    calls = []
+    monkeypatch.setattr(submissions, "invalidate_best_cache", lambda: calls.append(1))
+    return calls
+
+
+def _hero_stats():
+    with db_connection() as conn:
+        return [
+            tuple(row)
+            for row in conn.execute(
+                "SELECT steamAccountId, heroId, matches, wins FROM hero_stats"
+                " ORDER BY steamAccountId, heroId"
+            )
+        ]
+
+
+def _best():
+    with db_connection() as conn:
+        return [
+            tuple(row)
+            for row in conn.execute(
+                "SELECT hero_id, player_id, matches, wins FROM best ORDER BY hero_id"
+            )
+        ]
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [("x", None), (None, None), ("5", 5), (True, 1)],
+)
+@pytest.mark.parametrize("field", ["heroId", "matches", "wins"])
+def test_hero_fields_are_coerced_like_int(invalidations, field, value, expected):
+    hero = {"heroId": 2, "matches": 7, "wins": 3}
+    hero[field] = value
+
+    submissions.process_hero_submission(11, [hero])
+
+    if expected is None:
+        assert _hero_stats() == []
+    else:
+        row = {"steamAccountId": 11, **hero, field: expected}
+        assert _hero_stats() == [
+            (row["steamAccountId"], row["heroId"], row["matches"], row["wins"])
+        ]
+
+
+def test_hero_submission_updates_best_and_invalidates_cache(invalidations):
+    submissions.process_hero_submission(
+        1, [{"heroId": 1, "matches": 10, "wins": 6}, {"heroId": 2, "games": 4}]
+    )
+
+    assert _hero_stats() == [(1, 1, 10, 6), (1, 2, 4, 0)]
+    assert _best() == [(1, 1, 10, 6), (2, 1, 4, 0)]
+    assert len(invalidations) == 1
+
+    submissions.process_hero_submission(2, [{"heroId": 1, "matches": 5, "wins": 5}])
+
+    assert _best() == [(1, 1, 10, 6), (2, 1, 4, 0)]
+    assert len(invalidations) == 1
+
+
+def test_submission_batch_writes_heroes_and_discoveries(invalidations):
+    submissions._process_submission_batch(
+        [
+            ("hero", (1, [{"heroId": 1, "matches": 3, "wins": 2}])),
+            ("hero", (2, [{"heroId": 1, "matches": 8, "wins": 1}])),
+            ("discover", (1, [5, {"id": 6, "count": 2}, 1], None, None, 0)),
+        ]
+    )
+
+    assert _hero_stats() == [(1, 1, 3, 2), (2, 1, 8, 1)]
+    assert _best() == [(1, 2, 8, 1)]
+    assert len(invalidations) == 1
+    with db_connection() as conn:
+        players = conn.execute(
+            "SELECT steamAccountId, depth, seen_count FROM players"
+            " WHERE steamAccountId IN (5, 6) ORDER BY steamAccountId"
+        ).fetchall()
+    assert [tuple(row) for row in players] == [(5, 1, 1), (6, 1, 2)]
+
+
+def test_failed_batch_is_replayed_per_submission(invalidations, monkeypatch):
+    write_hero_submissions = submissions._write_hero_submissions
+    calls = []
+
+    def fail_first_write(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("combined write failed")
+        return write_hero_submissions(*args, **kwargs)
+
+    monkeypatch.setattr(submissions, "_write_hero_submissions", fail_first_write)
+
+    submissions._process_submission_batch(
+        [
+            ("hero", (1, [{"heroId": 1, "matches": 3, "wins": 2}])),
+            ("hero", (2, [{"heroId": 2, "matches": 4, "wins": 1}])),
+        ]
+    )
+
+    assert len(calls) == 3
+    assert _hero_stats() == [(1, 1, 3, 2), (2, 2, 4, 1)]
+    assert _best() == [(1, 1, 3, 2), (2, 2, 4, 1)]
+    assert len(invalidations) == 2